@@ -1,173 +1,553 @@
 import os
+import re
 import sys
+import math
+import fnmatch
 import argparse
-import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project src to path for snowflake utilities
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../src')))
-from utils.snowflake_connection import run_query
-
-def df_to_markdown(df):
-    """Simple converter from DataFrame to Markdown table without tabulate."""
-    if df is None or df.empty:
-        return ""
-    
-    headers = list(df.columns)
-    lines = ["| " + " | ".join(headers) + " |"]
-    lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
-    
-    for _, row in df.iterrows():
-        # Sanitize values to avoid breaking markdown (e.g. newlines)
-        row_values = []
-        for val in row:
-            v = str(val).replace('\n', ' ').replace('\r', '')
-            row_values.append(v)
-        lines.append("| " + " | ".join(row_values) + " |")
-    
-    return "\n".join(lines)
-
-def profile_entity(table_name):
-    """
-    Executes a series of queries to profile a Snowflake table/view.
-    Returns a markdown-formatted report.
-    """
-    print(f"Investigating {table_name}...")
-    
-    report = []
-    report.append(f"# Investigation Report: {table_name}")
-    report.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report.append("\n---\n")
+from utils.snowflake_connection import SESSION_POOL_SIZE, run_query
+from utils.markdown_table import render_markdown_table as df_to_markdown
 
-    # 1. Fetch Schema first to be dynamic
-    print("  - Fetching schema info...")
+# Columns profiled per generated stats query; wider tables are split into
+# several queries that run concurrently (Snowflake only reads the columns each
+# query references, so the split does not add full-table scans).
+PROFILE_COLUMNS_PER_QUERY = 150
+# Profiling queries (stats batches + drift) in flight at once.
+PROFILE_PARALLEL = 4
+
+ORDERABLE_TYPES = ('NUMBER', 'DECIMAL', 'INT', 'FLOAT', 'DOUBLE', 'REAL', 'DATE', 'TIME', 'TIMESTAMP')
+TEMPORAL_TYPES = ('DATE', 'TIMESTAMP')
+SEMI_STRUCTURED_TYPES = ('VARIANT', 'OBJECT', 'ARRAY', 'GEOGRAPHY', 'GEOMETRY', 'VECTOR')
+
+# Schema-wide column catalogs are served from the local query cache for this long.
+CATALOG_CACHE_TTL_SECONDS = 6 * 60 * 60
+# Tables profiled at once in batch mode (each runs up to --parallel queries;
+# jobs x parallel is capped at the Snowflake session pool size).
+BATCH_JOBS = 4
+
+# z for the 95% confidence intervals reported in sampled mode
+Z_95 = 1.96
+
+def split_table_name(table_name):
+    """(database or None, schema, table) from a 1-, 2- or 3-part name."""
     parts = table_name.split('.')
     if len(parts) == 3:
-        database_name = parts[0]
-        schema_name = parts[1]
-        table_name_short = parts[2]
-    elif len(parts) == 2:
-        database_name = None
-        schema_name = parts[0]
-        table_name_short = parts[1]
-    else:
-        database_name = None
-        schema_name = 'PUBLIC'
-        table_name_short = parts[0]
-    
+        return parts[0], parts[1], parts[2]
+    if len(parts) == 2:
+        return None, parts[0], parts[1]
+    return None, 'PUBLIC', parts[0]
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def fetch_schema(table_name):
+    """Column metadata (COLUMN_NAME, DATA_TYPE, IS_NULLABLE) in ordinal order, or None."""
+    database_name, schema_name, table_name_short = split_table_name(table_name)
     is_table = f"{database_name}.INFORMATION_SCHEMA.COLUMNS" if database_name else "INFORMATION_SCHEMA.COLUMNS"
-    
     q_schema = f"""
-    SELECT 
-        column_name, 
-        data_type, 
+    SELECT
+        column_name,
+        data_type,
         is_nullable
     FROM {is_table}
-    WHERE table_name = '{table_name_short.upper()}' 
+    WHERE table_name = '{table_name_short.upper()}'
       AND table_schema = '{schema_name.upper()}'
     ORDER BY ordinal_position
     """
     res_schema = run_query(q_schema)
     if res_schema is None or res_schema.empty:
-        return f"Error: Table {table_name} not found in {is_table}."
-    
-    all_cols = res_schema['COLUMN_NAME'].tolist()
-
-    # 1. Row Count 
-    print("  - Fetching volume...")
-    q_volume = f"SELECT COUNT(*) as total_rows FROM {table_name}"
-    res_vol = run_query(q_volume)
-    total_rows = res_vol['TOTAL_ROWS'].iloc[0] if res_vol is not None else 0
-    
-    report.append("## 1. Volume & Grain")
-    report.append(f"- **Total Rows**: {total_rows:,}")
-    
-    # Try to find meaningful ID columns for unique counts
+        return None
+    return res_schema
+
+def fetch_table_metadata(table_name):
+    """(ROW_COUNT, TABLE_TYPE) from INFORMATION_SCHEMA.TABLES; ROW_COUNT is None for views."""
+    database_name, schema_name, table_name_short = split_table_name(table_name)
+    is_tables = f"{database_name}.INFORMATION_SCHEMA.TABLES" if database_name else "INFORMATION_SCHEMA.TABLES"
+    res = run_query(f"""
+    SELECT row_count, table_type
+    FROM {is_tables}
+    WHERE table_name = '{table_name_short.upper()}'
+      AND table_schema = '{schema_name.upper()}'
+    """)
+    if res is None or res.empty:
+        return None, None
+    row_count = _stat(res.iloc[0].to_dict(), 'ROW_COUNT')
+    return (int(row_count) if row_count is not None else None), res['TABLE_TYPE'].iloc[0]
+
+def sample_clause(percent=None, rows=None, method='BERNOULLI'):
+    """
+    Snowflake SAMPLE clause. Percent sampling uses `method` (BERNOULLI samples
+    rows and reads them all; SYSTEM reads only a fraction of micro-partitions);
+    a fixed row count always samples rows.
+    """
+    if rows:
+        return f" SAMPLE ({int(rows)} ROWS)"
+    if percent:
+        return f" SAMPLE {method} ({percent:g})"
+    return ""
+
+def wilson_interval(k, n, z=Z_95):
+    """Wilson score interval for a proportion k/n."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = k / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+def pick_key_columns(all_cols):
+    """(best id column, best clinic column); either may be None."""
     id_candidates = [c for c in all_cols if any(x in c.upper() for x in ['ID', 'KEY', 'CODE'])]
     clinic_candidates = [c for c in all_cols if any(x in c.upper() for x in ['CLINIC_ID', 'RETAIL_ID'])]
-    
-    if id_candidates or clinic_candidates:
-        select_parts = []
-        if id_candidates:
-            # Pick the most likely primary ID (usually first one or shortest name)
-            best_id = sorted(id_candidates, key=len)[0]
-            select_parts.append(f"COUNT(DISTINCT {best_id}) as distinct_{best_id.lower()}")
-        if clinic_candidates:
-            best_clinic = sorted(clinic_candidates, key=len)[0]
-            select_parts.append(f"COUNT(DISTINCT {best_clinic}) as distinct_{best_clinic.lower()}")
-            
-        if select_parts:
-            q_distinct = f"SELECT {', '.join(select_parts)} FROM {table_name}"
-            try:
-                res_dist = run_query(q_distinct)
-                if res_dist is not None:
-                    for col in res_dist.columns:
-                        report.append(f"- **{col.replace('_', ' ').title()}**: {res_dist[col].iloc[0]:,}")
-            except:
-                pass
-
-    # 2. Schema Summary
+    # Pick the most likely primary ID (usually first one or shortest name)
+    best_id = sorted(id_candidates, key=len)[0] if id_candidates else None
+    best_clinic = sorted(clinic_candidates, key=len)[0] if clinic_candidates else None
+    return best_id, best_clinic
+
+def pick_timestamp_column(schema_df):
+    """Best column for monthly drift: CREATED_AT first, then the shortest temporal name."""
+    temporal = [
+        c for c, t in zip(schema_df['COLUMN_NAME'], schema_df['DATA_TYPE'])
+        if str(t).upper().startswith(TEMPORAL_TYPES)
+    ]
+    for cand in temporal:
+        if 'CREATED_AT' in cand.upper():
+            return cand
+    hinted = [c for c in temporal if any(x in c.upper() for x in ['AT', 'DATE', 'TIME', 'CREATED', 'INSERTED'])]
+    candidates = hinted or temporal
+    return sorted(candidates, key=len)[0] if candidates else None
+
+def build_stats_queries(table_name, schema_df, key_columns, columns_per_query=PROFILE_COLUMNS_PER_QUERY):
+    """
+    Generate the column statistics queries.
+
+    Each query computes, in one scan, COUNT(*) plus for every column in its
+    batch: non-null count, APPROX_COUNT_DISTINCT and (for orderable types)
+    MIN/MAX. The first batch also carries exact COUNT(DISTINCT) for the key
+    columns. Aliases are positional (B<j>_ROWS, C<i>_NN, C<i>_ND, ...) so any
+    column name works; each batch reports its own row count because over a
+    SAMPLE every query draws its own sample. Returns [(query, [column indexes])].
+    """
+    columns = list(zip(schema_df['COLUMN_NAME'], schema_df['DATA_TYPE']))
+    queries = []
+    for start in range(0, max(len(columns), 1), columns_per_query):
+        exprs = [f"COUNT(*) AS B{len(queries)}_ROWS"]
+        if start == 0:
+            for i, col in enumerate(key_columns):
+                exprs.append(f"COUNT(DISTINCT {quote_ident(col)}) AS K{i}_DISTINCT")
+        indexes = list(range(start, min(start + columns_per_query, len(columns))))
+        for i in indexes:
+            name, data_type = columns[i]
+            col = quote_ident(name)
+            data_type = str(data_type).upper()
+            exprs.append(f"COUNT({col}) AS C{i}_NN")
+            if not data_type.startswith(SEMI_STRUCTURED_TYPES):
+                exprs.append(f"APPROX_COUNT_DISTINCT({col}) AS C{i}_ND")
+            if data_type.startswith(ORDERABLE_TYPES):
+                exprs.append(f"MIN({col}) AS C{i}_MIN")
+                exprs.append(f"MAX({col}) AS C{i}_MAX")
+        queries.append(("SELECT\n  " + ",\n  ".join(exprs) + f"\nFROM {table_name}", indexes))
+    return queries
+
+def build_drift_query(table_name, ts_column):
+    col = quote_ident(ts_column)
+    return f"""
+    SELECT
+        DATE_TRUNC('month', {col})::DATE as month,
+        COUNT(*) as row_count
+    FROM {table_name}
+    WHERE {col} IS NOT NULL
+    GROUP BY 1 ORDER BY 1 DESC
+    LIMIT 24
+    """
+
+def _stat(row, key):
+    import pandas as pd
+
+    value = row.get(key)
+    try:
+        if value is None or pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+def profile_entity(table_name, schema_df=None, parallel=PROFILE_PARALLEL,
+                   sample_percent=None, sample_rows=None, sample_method='BERNOULLI'):
+    """
+    Profiles a Snowflake table/view and returns a markdown-formatted report.
+    See profile_table for the arguments.
+    """
+    report_md, _ = profile_table(table_name, schema_df, parallel, sample_percent, sample_rows, sample_method)
+    return report_md
+
+def profile_table(table_name, schema_df=None, parallel=PROFILE_PARALLEL,
+                  sample_percent=None, sample_rows=None, sample_method='BERNOULLI'):
+    """
+    Profiles a Snowflake table/view. Returns (markdown report, summary dict
+    with table, status, rows, columns and drift column).
+
+    Row count, exact distinct keys, and per-column null count, approximate
+    distinct and min/max come from generated single-scan stats queries; the
+    monthly drift histogram runs concurrently with them.
+
+    With sample_percent or sample_rows every query reads a SAMPLE of the
+    table: null rates get 95% Wilson intervals, drift counts are scaled to
+    table-level estimates, and the total row count comes only from
+    INFORMATION_SCHEMA.TABLES.ROW_COUNT. The intervals assume row-level
+    sampling; with sample_method='SYSTEM' rows come in micro-partition
+    blocks, so the ranges are reported as indicative only.
+    """
+    print(f"Investigating {table_name}...")
+
+    report = []
+    report.append(f"# Investigation Report: {table_name}")
+    report.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report.append("\n---\n")
+
+    # 1. Fetch Schema first to be dynamic
+    if schema_df is None:
+        print("  - Fetching schema info...")
+        schema_df = fetch_schema(table_name)
+    if schema_df is None or schema_df.empty:
+        return (f"Error: Table {table_name} not found in INFORMATION_SCHEMA.COLUMNS.",
+                {'table': table_name, 'status': 'not found', 'rows': None, 'columns': 0, 'drift_by': None})
+
+    all_cols = schema_df['COLUMN_NAME'].tolist()
+    key_columns = [c for c in pick_key_columns(all_cols) if c]
+    key_columns = list(dict.fromkeys(key_columns))
+    best_ts = pick_timestamp_column(schema_df)
+
+    # 2. Stats batches and drift are independent: run them together
+    source = table_name + sample_clause(sample_percent, sample_rows, sample_method)
+    sampled = source != table_name
+    # SYSTEM samples whole micro-partitions: correlated rows make the
+    # row-level intervals below too narrow
+    block_sampled = sampled and not sample_rows and sample_method == 'SYSTEM'
+    stats_queries = build_stats_queries(source, schema_df, key_columns)
+    print(f"  - Profiling {len(all_cols)} columns in {len(stats_queries)} stats quer"
+          f"{'y' if len(stats_queries) == 1 else 'ies'}" + (f" + drift by {best_ts}" if best_ts else "")
+          + (f" on{source[len(table_name):]}" if sampled else "") + "...")
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        stats_futures = [executor.submit(run_query, q) for q, _ in stats_queries]
+        drift_future = executor.submit(run_query, build_drift_query(source, best_ts)) if best_ts else None
+        # Sampled mode: the exact row count comes from metadata, never from a scan
+        meta_future = executor.submit(fetch_table_metadata, table_name) if sampled else None
+        stats_results = [f.result() for f in stats_futures]
+        res_drift = drift_future.result() if drift_future else None
+        metadata_rows = meta_future.result()[0] if meta_future else None
+
+    # Over a SAMPLE each stats query reads a different sample, so every column
+    # is measured against the row count of its own batch
+    stats, batch_rows, column_rows = {}, [], {}
+    for j, ((_, indexes), res) in enumerate(zip(stats_queries, stats_results)):
+        if res is None or res.empty:
+            continue
+        batch = res.iloc[0].to_dict()
+        stats.update(batch)
+        rows = int(_stat(batch, f"B{j}_ROWS") or 0)
+        batch_rows.append(rows)
+        column_rows.update(dict.fromkeys(indexes, rows))
+    scanned_rows = batch_rows[0] if batch_rows else 0
+    total_rows = metadata_rows if sampled else scanned_rows
+
+    def sample_scale(rows):
+        """Factor from counts over `rows` sampled rows to table-level estimates (None = unknown)."""
+        if total_rows is not None and rows:
+            return total_rows / rows
+        return 100.0 / sample_percent if sample_percent else None
+
+    scale = sample_scale(scanned_rows) if sampled else None
+
+    report.append("## 1. Volume & Grain")
+    if sampled:
+        report.append(f"- **Mode**: sampled (`{source[len(table_name):].strip()}`), "
+                      + (f"{scanned_rows:,} rows read; " if len(set(batch_rows)) <= 1 else
+                         f"{' / '.join(f'{r:,}' for r in batch_rows)} rows read by the stats queries; ")
+                      + ("ranges are indicative only (block sample: they assume row sampling "
+                         "and understate the error; use --sample-method bernoulli for real 95% intervals)"
+                         if block_sampled else "ranges are 95% confidence intervals"))
+        report.append(f"- **Total Rows (metadata)**: {total_rows:,}" if total_rows is not None
+                      else "- **Total Rows (metadata)**: n/a (view or no metadata)")
+    else:
+        report.append(f"- **Total Rows**: {total_rows:,}")
+    for i, col in enumerate(key_columns):
+        distinct = _stat(stats, f"K{i}_DISTINCT")
+        if distinct is not None:
+            label = f"Distinct {col.replace('_', ' ').title()}" + (" (in sample)" if sampled else "")
+            report.append(f"- **{label}**: {int(distinct):,}")
+
+    # Schema Summary
     report.append("\n## 2. Schema Summary")
-    report.append(df_to_markdown(res_schema))
-
-    # 3. Null Analysis
-    print("  - Performing null analysis...")
-    if all_cols:
-        # Limit to first 30 columns to avoid query length issues
-        cols_to_check = all_cols[:30]
-        null_queries = [f"SUM(CASE WHEN {c} IS NULL THEN 1 ELSE 0 END) as {c}_nulls" for c in cols_to_check]
-        q_nulls = f"SELECT {', '.join(null_queries)} FROM {table_name}"
-        res_nulls = run_query(q_nulls)
-        if res_nulls is not None:
-            null_data = []
-            for c in cols_to_check:
-                n_count = res_nulls[f"{c.upper()}_NULLS"].iloc[0]
+    report.append(df_to_markdown(schema_df))
+
+    # 3. Column Profile (nulls, approximate distinct, range)
+    if stats:
+        profile = []
+        for i, col in enumerate(all_cols):
+            non_null = _stat(stats, f"C{i}_NN")
+            if non_null is None:
+                continue
+            rows = column_rows[i]
+            n_count = rows - int(non_null)
+            distinct = _stat(stats, f"C{i}_ND")
+            min_v = _stat(stats, f"C{i}_MIN")
+            max_v = _stat(stats, f"C{i}_MAX")
+            if sampled:
+                low, high = wilson_interval(n_count, rows)
+                n_pct = (n_count / rows * 100) if rows > 0 else 0
+                col_scale = sample_scale(rows)
+                row = {
+                    "Column": col,
+                    "Est. Null Count": f"~{round(n_count * col_scale):,}" if col_scale else "",
+                    "Null %": f"{n_pct:.2f}% [{low * 100:.2f}, {high * 100:.2f}]" + (" (indicative)" if block_sampled else ""),
+                    "Distinct in Sample": f"{int(distinct):,}" if distinct is not None else "",
+                }
+            else:
                 n_pct = (n_count / total_rows * 100) if total_rows > 0 else 0
-                null_data.append({"Column": c, "Null Count": n_count, "Null %": f"{n_pct:.2f}%"})
-            
-            report.append("\n## 3. Null Analysis")
-            report.append(df_to_markdown(pd.DataFrame(null_data)))
+                row = {
+                    "Column": col,
+                    "Null Count": n_count,
+                    "Null %": f"{n_pct:.2f}%",
+                    "Approx Distinct": f"{int(distinct):,}" if distinct is not None else "",
+                }
+            row["Min"] = "" if min_v is None else min_v
+            row["Max"] = "" if max_v is None else max_v
+            profile.append(row)
+        report.append("\n## 3. Column Profile" + (" (sample)" if sampled else ""))
+        report.append(df_to_markdown(profile, max_col_width=60))
 
     # 4. Temporal Drift
-    print("  - Fetching temporal drift...")
-    ts_candidates = [c for c in all_cols if any(x in c.upper() for x in ['AT', 'DATE', 'TIME', 'CREATED', 'INSERTED'])]
-    if ts_candidates:
-        # Pick the best timestamp (usually the one with "CREATED" or shortest "AT")
-        best_ts = None
-        for cand in ts_candidates:
-            if 'CREATED_AT' in cand.upper():
-                best_ts = cand
-                break
-        if not best_ts:
-            best_ts = sorted(ts_candidates, key=len)[0]
-            
-        q_drift = f"""
-        SELECT 
-            DATE_TRUNC('month', {best_ts})::DATE as month,
-            COUNT(*) as row_count
-        FROM {table_name}
-        WHERE {best_ts} IS NOT NULL
-        GROUP BY 1 ORDER BY 1 DESC
-        LIMIT 24
-        """
-        try:
-            res_drift = run_query(q_drift)
-            if res_drift is not None:
-                report.append(f"\n## 4. Temporal Drift (by {best_ts})")
-                report.append(df_to_markdown(res_drift))
-        except:
-            pass
+    if res_drift is not None:
+        if sampled and scale and not res_drift.empty:
+            # Poisson interval on the sampled count, scaled to the table
+            counts = res_drift['ROW_COUNT'].astype(float)
+            res_drift = res_drift.assign(
+                EST_ROWS=(counts * scale).round().astype('int64'),
+                **{'RANGE_INDICATIVE' if block_sampled else 'CI_95': [
+                    f"[{max(0.0, c - Z_95 * math.sqrt(c)) * scale:,.0f}, {(c + Z_95 * math.sqrt(c)) * scale:,.0f}]"
+                    for c in counts
+                ]},
+            ).rename(columns={'ROW_COUNT': 'SAMPLED_ROWS'})
+        report.append(f"\n## 4. Temporal Drift (by {best_ts})")
+        report.append(df_to_markdown(res_drift))
+
+    summary = {
+        'table': table_name,
+        'status': 'ok' if stats else 'error',
+        'rows': total_rows,
+        'columns': len(all_cols),
+        'drift_by': best_ts,
+    }
+    return "\n".join(report), summary
+
+# --- Batch mode ------------------------------------------------------------
+
+TABLE_NAME_RE = re.compile(r'\b[A-Za-z_][\w$]*\.[A-Za-z_][\w$]*\.[A-Za-z_][\w$]*\b')
+# Free-text references must be upper-case DB.SCHEMA.TABLE, not part of a longer
+# dotted name or path (so SAAS.clinics.id or CLINICS.semantic.md do not count)
+QUALIFIED_TABLE_RE = re.compile(r'(?<![\w$./])[A-Z_][A-Z0-9_$]*\.[A-Z_][A-Z0-9_$]*\.[A-Z_][A-Z0-9_$]*(?!\.?[\w$/])')
+INDEX_TABLE_FIELDS = ('table', 'snowflake_table', 'physical_table', 'source_table')
+# Values that are file references, never table names
+INDEX_FILE_SUFFIXES = ('.md', '.yaml', '.yml')
+
+def fetch_schema_catalog(database_name, schema_name, refresh=False):
+    """
+    Column metadata for every table of a schema in one INFORMATION_SCHEMA
+    query: {TABLE_NAME: schema DataFrame}. Served from the local query cache
+    (CATALOG_CACHE_TTL_SECONDS) unless refresh.
+    """
+    is_table = f"{database_name}.INFORMATION_SCHEMA.COLUMNS" if database_name else "INFORMATION_SCHEMA.COLUMNS"
+    res = run_query(f"""
+    SELECT
+        table_name,
+        column_name,
+        data_type,
+        is_nullable
+    FROM {is_table}
+    WHERE table_schema = '{schema_name.upper()}'
+    ORDER BY table_name, ordinal_position
+    """, cache=False if refresh else CATALOG_CACHE_TTL_SECONDS)
+    if res is None or res.empty:
+        return {}
+    return {
+        name: group.drop(columns='TABLE_NAME').reset_index(drop=True)
+        for name, group in res.groupby('TABLE_NAME', sort=False)
+    }
+
+def tables_from_index(index_path):
+    """
+    Fully qualified tables referenced by an ontology index YAML. Uses an
+    explicit table field of each entity when present, otherwise any
+    upper-case DB.SCHEMA.TABLE reference found in the entity's string values
+    (doc paths and other file references are skipped).
+    """
+    import yaml
+
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = yaml.safe_load(f) or {}
+
+    def strings(node):
+        if isinstance(node, str):
+            if not node.strip().lower().endswith(INDEX_FILE_SUFFIXES):
+                yield node
+        elif isinstance(node, dict):
+            for value in node.values():
+                yield from strings(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from strings(value)
+
+    tables = []
+    for entity in index.get('entities') or []:
+        explicit = [entity[k] for k in INDEX_TABLE_FIELDS if isinstance(entity, dict) and entity.get(k)]
+        if explicit:
+            for text in explicit:
+                tables.extend(m.upper() for m in TABLE_NAME_RE.findall(str(text)))
+        else:
+            for text in strings(entity):
+                tables.extend(QUALIFIED_TABLE_RE.findall(text))
+    return list(dict.fromkeys(tables))
+
+def resolve_tables(patterns, refresh_catalog=False):
+    """
+    Expand table names / globs (e.g. DB.SCHEMA.C1_*) against schema catalogs,
+    fetching each schema's catalog once. Returns ([(table, schema_df)], [missing patterns]).
+    """
+    by_schema = {}
+    for pattern in patterns:
+        database_name, schema_name, name = split_table_name(pattern)
+        key = (database_name.upper() if database_name else None, schema_name.upper())
+        by_schema.setdefault(key, []).append((pattern, name.upper()))
+
+    resolved, missing = {}, []
+    for (database_name, schema_name), entries in by_schema.items():
+        catalog = fetch_schema_catalog(database_name, schema_name, refresh=refresh_catalog)
+        prefix = f"{database_name}.{schema_name}" if database_name else schema_name
+        for pattern, name in entries:
+            matches = [t for t in catalog if fnmatch.fnmatchcase(t, name)]
+            if not matches:
+                missing.append(pattern)
+            for table in matches:
+                resolved.setdefault(f"{prefix}.{table}", catalog[table])
+    return list(resolved.items()), missing
+
+def report_filename(table_name):
+    return re.sub(r'[^\w.-]', '_', table_name) + ".md"
 
-    return "\n".join(report)
+def profile_batch(patterns, output_dir, jobs=BATCH_JOBS, refresh_catalog=False, **profile_kwargs):
+    """
+    Profile many tables: column metadata comes from one query per schema,
+    up to `jobs` tables are profiled at once, and each report is written to
+    output_dir next to an INDEX.md summary. Returns the summaries.
+
+    jobs x parallel queries would each hold a Snowflake session, so per-table
+    parallelism is lowered to keep the total within SESSION_POOL_SIZE.
+    """
+    tables, missing = resolve_tables(patterns, refresh_catalog)
+    for pattern in missing:
+        print(f"[WARN] No table matches {pattern}")
+    if not tables:
+        return []
+
+    jobs = max(1, min(jobs, SESSION_POOL_SIZE))
+    parallel = max(1, profile_kwargs.get('parallel', PROFILE_PARALLEL))
+    if jobs * parallel > SESSION_POOL_SIZE:
+        profile_kwargs['parallel'] = max(1, SESSION_POOL_SIZE // jobs)
+        print(f"[WARN] {jobs} jobs x {parallel} parallel queries exceed the {SESSION_POOL_SIZE}-session pool; "
+              f"using {profile_kwargs['parallel']} parallel queries per table")
+
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"Profiling {len(tables)} tables ({jobs} at a time) into {output_dir}")
+
+    def run(item):
+        table_name, schema_df = item
+        report_md, summary = profile_table(table_name, schema_df, **profile_kwargs)
+        summary['report'] = report_filename(table_name)
+        with open(os.path.join(output_dir, summary['report']), "w", encoding="utf-8") as f:
+            f.write(report_md)
+        return summary
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        summaries = list(executor.map(run, tables))
+
+    index = [
+        {
+            "Table": f"[{s['table']}]({s['report']})",
+            "Status": s['status'],
+            "Rows": f"{s['rows']:,}" if s['rows'] is not None else "n/a",
+            "Columns": s['columns'],
+            "Drift By": s['drift_by'] or "",
+        }
+        for s in summaries
+    ]
+    lines = [
+        "# Investigation Index",
+        f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        df_to_markdown(index),
+    ]
+    if missing:
+        lines += ["", "**Not found**: " + ", ".join(missing)]
+    with open(os.path.join(output_dir, "INDEX.md"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return summaries
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Profile a Snowflake table or view")
-    parser.add_argument("--table", required=True, help="Full table name (DATABASE.SCHEMA.TABLE)")
-    parser.add_argument("--output", help="Optional output file path")
+    parser = argparse.ArgumentParser(description="Profile Snowflake tables or views")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--table", help="Full table name (DATABASE.SCHEMA.TABLE); a glob like DB.SCHEMA.C1_* runs batch mode")
+    target.add_argument("--tables", nargs="+", metavar="TABLE", help="Several tables or globs (batch mode)")
+    target.add_argument("--from-index", metavar="YAML", help="Every table referenced by an ontology index (batch mode)")
+    parser.add_argument("--output", help="Optional output file path (single table)")
+    parser.add_argument("--output-dir", default="investigation_reports",
+                        help="Batch mode: directory for per-table reports and INDEX.md (default: investigation_reports)")
+    parser.add_argument("--jobs", type=int, default=BATCH_JOBS,
+                        help=f"Batch mode: tables profiled at once (default: {BATCH_JOBS})")
+    parser.add_argument("--refresh-catalog", action="store_true",
+                        help="Batch mode: re-read INFORMATION_SCHEMA instead of the cached schema catalog")
+    parser.add_argument("--parallel", type=int, default=PROFILE_PARALLEL,
+                        help=f"Profiling queries run concurrently (default: {PROFILE_PARALLEL})")
+    sample = parser.add_mutually_exclusive_group()
+    sample.add_argument("--sample", metavar="PERCENT",
+                        help="Profile a sample of the table, e.g. 1%% (estimates with confidence intervals)")
+    sample.add_argument("--sample-rows", type=int, metavar="N",
+                        help="Profile a fixed-size row sample of N rows")
+    parser.add_argument("--sample-method", choices=["bernoulli", "system"], default="bernoulli",
+                        help="Percent sampling: bernoulli (row-level; default) or system (block, cheapest, "
+                             "intervals only indicative)")
     args = parser.parse_args()
 
-    report_md = profile_entity(args.table)
-    
+    sample_percent = None
+    if args.sample:
+        try:
+            sample_percent = float(args.sample.rstrip('%'))
+        except ValueError:
+            parser.error(f"--sample expects a percentage like 1% (got {args.sample!r})")
+        if not 0 < sample_percent <= 100:
+            parser.error("--sample must be between 0 and 100%")
+
+    profile_kwargs = dict(parallel=args.parallel, sample_percent=sample_percent,
+                          sample_rows=args.sample_rows, sample_method=args.sample_method.upper())
+
+    if not args.table or any(ch in args.table for ch in '*?['):
+        patterns = args.tables or ([args.table] if args.table else tables_from_index(args.from_index))
+        if not patterns:
+            parser.error(f"No DB.SCHEMA.TABLE references found in {args.from_index}")
+        summaries = profile_batch(patterns, args.output_dir, jobs=args.jobs,
+                                  refresh_catalog=args.refresh_catalog, **profile_kwargs)
+        failed = [s for s in summaries if s['status'] != 'ok']
+        print(f"\n{len(summaries) - len(failed)}/{len(summaries)} tables profiled; "
+              f"index at {os.path.join(args.output_dir, 'INDEX.md')}")
+        sys.exit(1 if failed or not summaries else 0)
+
+    report_md = profile_entity(args.table, **profile_kwargs)
+
     if args.output:
         with open(args.output, "w", encoding="utf-8") as f:
             f.write(report_md)
@@ -0,0 +1,119 @@
+"""
+Axiom Result Store
+Local SQLite history of axiom validations, used by validate.py to skip
+axioms whose query and source tables have not changed since the last run.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS axiom_results (
+    axiom_id            TEXT NOT NULL,
+    run_at              TEXT NOT NULL,
+    query_hash          TEXT NOT NULL,
+    tables_fingerprint  TEXT,
+    bucket              TEXT NOT NULL,
+    status              TEXT NOT NULL,
+    count               INTEGER,
+    elapsed             REAL,
+    cached              INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_axiom_results_axiom ON axiom_results (axiom_id, run_at);
+"""
+
+
+def query_hash(sql: str) -> str:
+    """Hash of the query with whitespace normalized."""
+    return hashlib.sha256(" ".join(sql.split()).encode('utf-8')).hexdigest()
+
+
+def tables_fingerprint(last_altered: dict):
+    """
+    Fingerprint of {table: last_altered}. None when any table has no usable
+    timestamp, which makes the axiom uncacheable.
+    """
+    if not last_altered or any(v is None for v in last_altered.values()):
+        return None
+    payload = "|".join(f"{table}={stamp}" for table, stamp in sorted(last_altered.items()))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AxiomResultStore:
+    """Append-only validation history; the latest good row per axiom doubles as cache."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+    def lookup(self, axiom_id: str, q_hash: str, fingerprint):
+        """Latest non-error result for this exact query and table state, or None."""
+        if fingerprint is None:
+            return None
+        row = self.conn.execute(
+            """
+            SELECT query_hash, tables_fingerprint, bucket, status, count, run_at
+            FROM axiom_results
+            WHERE axiom_id = ? AND bucket != 'error'
+            ORDER BY run_at DESC, rowid DESC
+            LIMIT 1
+            """,
+            (axiom_id,),
+        ).fetchone()
+        # Only reuse when the latest result was computed for this query and table state
+        if row is None or row[:2] != (q_hash, fingerprint):
+            return None
+        _, _, bucket, status, count, run_at = row
+        return {'bucket': bucket, 'status': status, 'count': count, 'run_at': run_at}
+
+    def record(self, axiom_id: str, q_hash: str, fingerprint, bucket: str, record: dict, cached: bool):
+        self.conn.execute(
+            """
+            INSERT INTO axiom_results
+                (axiom_id, run_at, query_hash, tables_fingerprint, bucket, status, count, elapsed, cached)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                axiom_id,
+                datetime.now().isoformat(timespec='seconds'),
+                q_hash,
+                fingerprint,
+                bucket,
+                record.get('status', bucket.upper()),
+                record.get('count'),
+                record.get('elapsed'),
+                int(cached),
+            ),
+        )
+        self.conn.commit()
+
+    def history(self, axiom_id: str, limit: int = 20) -> list:
+        """Most recent results first: [(run_at, status, count, elapsed, cached)]."""
+        return self.conn.execute(
+            """
+            SELECT run_at, status, count, elapsed, cached
+            FROM axiom_results
+            WHERE axiom_id = ?
+            ORDER BY run_at DESC, rowid DESC
+            LIMIT ?
+            """,
+            (axiom_id, limit),
+        ).fetchall()
+
+    def last_validated(self) -> dict:
+        """axiom_id -> date (YYYY-MM-DD) of the latest non-error query execution."""
+        rows = self.conn.execute(
+            """
+            SELECT axiom_id, MAX(run_at)
+            FROM axiom_results
+            WHERE bucket != 'error' AND cached = 0
+            GROUP BY axiom_id
+            """
+        ).fetchall()
+        return {axiom_id: run_at[:10] for axiom_id, run_at in rows}
+
+    def close(self):
+        self.conn.close()
@@ -5,8 +5,12 @@ Validates all axioms defined in AXIOMS.yaml against Snowflake.
 
 import sys
 import os
+import re
+import time
+import argparse
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 # validate.py lives in: <repo>/.cursor/skills/validate-axioms/scripts/validate.py
@@ -16,6 +20,12 @@ sys.path.insert(0, str(project_root / "src" / "utils"))
 
 import yaml
 from snowflake_connection import validate_axiom, run_query
+from result_store import AxiomResultStore, query_hash, tables_fingerprint
+from markdown_table import render_markdown_table
+from sql_tables import strip_sql_comments, table_refs
+
+# Local validation history (gitignored), also used as result cache
+RESULT_STORE_PATH = project_root / ".axiom_results.sqlite"
 
 
 def load_axioms(axioms_path: Path) -> list:
@@ -25,8 +35,281 @@ def load_axioms(axioms_path: Path) -> list:
     return data.get('axioms', [])
 
 
-def validate_all_axioms(axioms: list) -> dict:
-    """Validate all axioms and return results."""
+def classify(axiom: dict, count: int, elapsed: float) -> tuple:
+    """Map a violations count to (bucket, record) according to the axiom severity."""
+    axiom_id = axiom.get('id', 'UNKNOWN')
+    severity = (axiom.get('severity') or '').upper()
+    if count == 0:
+        return 'pass', {'axiom_id': axiom_id, 'status': 'PASS', 'count': 0, 'severity': severity, 'elapsed': elapsed}
+    if severity == 'HARD':
+        return 'fail', {'axiom_id': axiom_id, 'status': 'FAIL', 'count': count, 'severity': severity, 'elapsed': elapsed}
+    if severity == 'TEMPORAL':
+        return 'info', {'axiom_id': axiom_id, 'status': 'INFO', 'count': count, 'severity': severity, 'elapsed': elapsed}
+    # Default: SOFT and unknown severities are treated as warnings
+    return 'warn', {'axiom_id': axiom_id, 'status': 'WARN', 'count': count, 'severity': severity or 'SOFT', 'elapsed': elapsed}
+
+
+def timed_out(elapsed: float, timeout: int = None) -> bool:
+    """
+    Whether a failed query was cancelled by `timeout`. run_query() only
+    returns None on failure, so this goes by the time the attempt took.
+    """
+    return bool(timeout) and elapsed >= timeout
+
+
+def timeout_record(axiom: dict, timeout: int, elapsed: float) -> tuple:
+    """('error', record) for an axiom whose query hit the timeout."""
+    return 'error', {
+        'axiom_id': axiom.get('id', 'UNKNOWN'),
+        'status': 'TIMEOUT',
+        'count': -1,
+        'message': f"Query cancelled after the {timeout}s timeout",
+        'elapsed': elapsed
+    }
+
+
+def evaluate_axiom(axiom: dict, timeout: int = None) -> tuple:
+    """
+    Run one axiom's validation_query and classify it.
+
+    Returns (bucket, record) where bucket is a key of the results dict.
+    """
+    axiom_id = axiom.get('id', 'UNKNOWN')
+    validation_query = axiom.get('validation_query')
+
+    if not validation_query:
+        return 'skip', {
+            'axiom_id': axiom_id,
+            'reason': 'No validation_query defined'
+        }
+
+    # Execute query and interpret first cell as "violations count"
+    started = time.perf_counter()
+    try:
+        df = run_query(validation_query, timeout=timeout)
+        if df is None:
+            raise RuntimeError("query failed or timed out (see error above)")
+        if df.empty:
+            count = 0
+        else:
+            count = df.iloc[0, 0]
+            if count is None:
+                count = 0
+            count = int(count)
+    except Exception as e:
+        elapsed = time.perf_counter() - started
+        if timed_out(elapsed, timeout):
+            return timeout_record(axiom, timeout, elapsed)
+        return 'error', {
+            'axiom_id': axiom_id,
+            'status': 'ERROR',
+            'count': -1,
+            'message': f"Failed to execute query: {e}",
+            'elapsed': time.perf_counter() - started
+        }
+
+    return classify(axiom, count, time.perf_counter() - started)
+
+
+# --- Scan fusion ---------------------------------------------------------
+# Axioms shaped like `SELECT COUNT(*) FROM <table> [alias] [WHERE <cond>]`
+# that hit the same table are answered by one scan:
+#   SELECT COUNT_IF(<cond1>), COUNT_IF(<cond2>), ... FROM <table> [alias]
+# Anything else (joins, CTEs, subqueries, grouping) runs on its own.
+
+COUNT_QUERY_RE = re.compile(
+    r"^\s*SELECT\s+COUNT\s*\(\s*\*\s*\)(?:\s+AS\s+\w+)?"
+    r"\s+FROM\s+([\w.$\"]+)"
+    r"(?:\s+(?:AS\s+)?(?!WHERE\b)(\w+))?"
+    r"(?:\s+WHERE\s+(.*?))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+IDENT_PART_RE = re.compile(r'"(?:[^"]|"")*"|[^."]+')
+NOT_FUSABLE_RE = re.compile(
+    r"\b(SELECT|JOIN|GROUP\s+BY|HAVING|UNION|QUALIFY|LIMIT|ORDER\s+BY)\b",
+    re.IGNORECASE,
+)
+
+
+def identifier_key(name: str) -> str:
+    """
+    Case-folded form of a (possibly dotted) identifier, for grouping:
+    unquoted parts are upper-cased like Snowflake resolves them, quoted
+    parts are kept verbatim.
+    """
+    return ".".join(
+        part if part.startswith('"') else part.upper()
+        for part in IDENT_PART_RE.findall(name)
+    )
+
+
+def parse_count_query(sql: str):
+    """(table, alias, condition) as written, for a fusable COUNT(*) query, else None."""
+    match = COUNT_QUERY_RE.match(strip_sql_comments(sql))
+    if not match:
+        return None
+    table, alias, condition = match.groups()
+    condition = (condition or 'TRUE').strip()
+    if NOT_FUSABLE_RE.search(condition):
+        return None
+    return table, alias or '', condition
+
+
+def plan_validation_jobs(axioms: list, indexes: list = None) -> list:
+    """
+    Group axioms into jobs, in AXIOMS.yaml order of first appearance.
+
+    Each job is ('single', [index]) or ('fused', [indexes], table, alias,
+    [conditions]). Only scans shared by 2+ axioms are fused. `indexes`
+    restricts planning to those axioms (default: all).
+    """
+    groups = {}
+    jobs = []
+    for index in (range(len(axioms)) if indexes is None else indexes):
+        axiom = axioms[index]
+        query = axiom.get('validation_query')
+        parsed = parse_count_query(query) if query else None
+        if parsed is None:
+            jobs.append(('single', [index]))
+            continue
+        table, alias, condition = parsed
+        # Fused SQL uses the first axiom's spelling of the table
+        key = (identifier_key(table), alias.upper())
+        if key not in groups:
+            groups[key] = ('fused', [], table, alias, [])
+            jobs.append(groups[key])
+        groups[key][1].append(index)
+        groups[key][4].append(condition)
+
+    return [
+        ('single', job[1]) if job[0] == 'fused' and len(job[1]) == 1 else job
+        for job in jobs
+    ]
+
+
+def build_fused_query(table: str, alias: str, conditions: list) -> str:
+    counts = ",\n  ".join(f"COUNT_IF({cond}) AS V{i}" for i, cond in enumerate(conditions))
+    any_match = "\n   OR ".join(f"({cond})" for cond in conditions)
+    source = f"{table} {alias}".rstrip()
+    return f"SELECT\n  {counts}\nFROM {source}\nWHERE {any_match}"
+
+
+def run_job(job: tuple, axioms: list, timeout: int = None) -> list:
+    """Execute one job; returns [(axiom_index, bucket, record)]."""
+    if job[0] == 'single':
+        index = job[1][0]
+        return [(index, *evaluate_axiom(axioms[index], timeout))]
+
+    _, indexes, table, alias, conditions = job
+    started = time.perf_counter()
+    df = run_query(build_fused_query(table, alias, conditions), timeout=timeout)
+    elapsed = time.perf_counter() - started
+    if df is None and timed_out(elapsed, timeout):
+        # Re-running each member would cost up to N more timeouts on the same table
+        print(f"[WARN] Fused scan of {table} timed out; reporting its {len(indexes)} axioms as TIMEOUT")
+        return [(index, *timeout_record(axioms[index], timeout, elapsed)) for index in indexes]
+    if df is None or df.empty:
+        print(f"[WARN] Fused scan of {table} failed; validating its {len(indexes)} axioms one by one")
+        return [(index, *evaluate_axiom(axioms[index], timeout)) for index in indexes]
+
+    outcomes = []
+    for position, index in enumerate(indexes):
+        count = df.iloc[0, position]
+        outcomes.append((index, *classify(axioms[index], int(count or 0), elapsed)))
+    return outcomes
+
+
+# --- Result cache ----------------------------------------------------------
+# A previous result is reused when the axiom's query is unchanged and none of
+# the tables it reads has been altered since (INFORMATION_SCHEMA LAST_ALTERED).
+# Queries reading views, unqualified tables or the current date always run.
+
+VOLATILE_RE = re.compile(
+    r'\b(CURRENT_DATE|CURRENT_TIMESTAMP|SYSDATE|GETDATE|LOCALTIMESTAMP|RANDOM|UUID_STRING)\b',
+    re.IGNORECASE,
+)
+
+
+def referenced_tables(sql: str):
+    """
+    Fully qualified DB.SCHEMA.TABLE names a query reads, or None when the
+    result cannot be tied to table state (unqualified names, volatile functions).
+    Table extraction is shared with the ontology graph's table -> axioms index.
+    """
+    if VOLATILE_RE.search(strip_sql_comments(sql)):
+        return None
+    tables, complete = table_refs(sql)
+    return set(tables) if tables and complete else None
+
+
+def fetch_last_altered(tables: set) -> dict:
+    """
+    {DB.SCHEMA.TABLE: LAST_ALTERED} in one INFORMATION_SCHEMA query.
+    Views and tables that could not be looked up map to None (never cached).
+    """
+    stamps = {table: None for table in tables}
+    by_db = {}
+    for table in sorted(tables):
+        database, schema, name = table.split('.')
+        by_db.setdefault(database, {}).setdefault(schema, []).append(name)
+
+    parts = []
+    for database, schemas in by_db.items():
+        filters = " OR ".join(
+            f"(TABLE_SCHEMA = '{schema}' AND TABLE_NAME IN ({', '.join(repr(n) for n in names)}))"
+            for schema, names in schemas.items()
+        )
+        parts.append(
+            f"SELECT TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, LAST_ALTERED "
+            f"FROM {database}.INFORMATION_SCHEMA.TABLES WHERE {filters}"
+        )
+    if not parts:
+        return stamps
+
+    df = run_query("\nUNION ALL\n".join(parts))
+    if df is None:
+        return stamps
+    for catalog, schema, name, table_type, last_altered in df.itertuples(index=False):
+        if table_type == 'VIEW':
+            continue
+        stamps[f"{catalog}.{schema}.{name}".upper()] = str(last_altered)
+    return stamps
+
+
+def cache_keys(axioms: list) -> dict:
+    """index -> (query_hash, tables_fingerprint) for every axiom with a query."""
+    refs = {
+        index: referenced_tables(axiom['validation_query'])
+        for index, axiom in enumerate(axioms)
+        if axiom.get('validation_query')
+    }
+    stamps = fetch_last_altered(set().union(*(t for t in refs.values() if t)))
+    return {
+        index: (
+            query_hash(axioms[index]['validation_query']),
+            tables_fingerprint({t: stamps[t] for t in tables}) if tables else None,
+        )
+        for index, tables in refs.items()
+    }
+
+
+def validate_all_axioms(axioms: list, parallel: int = 1, timeout: int = None, fuse: bool = True,
+                        store: AxiomResultStore = None, force: bool = False) -> dict:
+    """
+    Validate all axioms and return results.
+
+    Up to `parallel` queries run at once, each on its own pooled Snowflake
+    session, so the run takes about as long as the slowest axiom instead of
+    the sum of all of them. `timeout` (seconds) cancels a single slow axiom,
+    which is then reported as TIMEOUT (an error). With `fuse`, simple COUNT(*)
+    axioms on the same table share one scan (see plan_validation_jobs); when
+    that scan times out all its axioms are TIMEOUT, and only other failures
+    fall back to running them one by one.
+
+    With a `store`, every result is recorded and axioms whose query and
+    source tables are unchanged since their last result are served from it
+    (unless `force`). Cached records carry 'cached': True.
+    """
     results = {
         'pass': [],
         'warn': [],
@@ -35,50 +318,49 @@ def validate_all_axioms(axioms: list) -> dict:
         'error': [],
         'skip': []
     }
-    
-    for axiom in axioms:
-        axiom_id = axiom.get('id', 'UNKNOWN')
-        validation_query = axiom.get('validation_query')
-        severity = (axiom.get('severity') or '').upper()
-        
-        if not validation_query:
-            results['skip'].append({
-                'axiom_id': axiom_id,
-                'reason': 'No validation_query defined'
-            })
-            continue
 
-        # Execute query and interpret first cell as "violations count"
-        try:
-            df = run_query(validation_query)
-            if df is None or df.empty:
-                count = 0
-            else:
-                count = df.iloc[0, 0]
-                if count is None:
-                    count = 0
-                count = int(count)
-        except Exception as e:
-            results['error'].append({
-                'axiom_id': axiom_id,
-                'status': 'ERROR',
-                'count': -1,
-                'message': f"Failed to execute query: {e}"
-            })
-            continue
+    outcomes = []
+    pending = list(range(len(axioms)))
+    keys = cache_keys(axioms) if store is not None else {}
+    if keys and not force:
+        pending = []
+        for index, axiom in enumerate(axioms):
+            hit = store.lookup(axiom.get('id', 'UNKNOWN'), *keys[index]) if index in keys else None
+            if hit is None:
+                pending.append(index)
+                continue
+            bucket, record = classify(axiom, hit['count'], 0.0)
+            record.update(cached=True, run_at=hit['run_at'])
+            outcomes.append((index, bucket, record))
+        if outcomes:
+            print(f"Serving {len(outcomes)} unchanged axioms from {store.path.name} (use --force to re-run)")
+
+    if fuse:
+        jobs = plan_validation_jobs(axioms, pending)
+    else:
+        jobs = [('single', [index]) for index in pending]
+    fused = [job for job in jobs if job[0] == 'fused']
+    if fused:
+        saved = sum(len(job[1]) - 1 for job in fused)
+        print(f"Fusing {saved + len(fused)} axioms into {len(fused)} shared table scan(s)")
+
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        outcomes += [
+            outcome
+            for job_outcomes in executor.map(lambda job: run_job(job, axioms, timeout), jobs)
+            for outcome in job_outcomes
+        ]
+
+    if store is not None:
+        for index, bucket, record in outcomes:
+            if index in keys:
+                store.record(axioms[index].get('id', 'UNKNOWN'), *keys[index], bucket, record,
+                             cached=record.get('cached', False))
+
+    # Report in AXIOMS.yaml order
+    for _, bucket, record in sorted(outcomes, key=lambda outcome: outcome[0]):
+        results[bucket].append(record)
 
-        # Classify based on severity
-        if count == 0:
-            results['pass'].append({'axiom_id': axiom_id, 'status': 'PASS', 'count': 0, 'severity': severity})
-        else:
-            if severity == 'HARD':
-                results['fail'].append({'axiom_id': axiom_id, 'status': 'FAIL', 'count': count, 'severity': severity})
-            elif severity == 'TEMPORAL':
-                results['info'].append({'axiom_id': axiom_id, 'status': 'INFO', 'count': count, 'severity': severity})
-            else:
-                # Default: SOFT and unknown severities are treated as warnings
-                results['warn'].append({'axiom_id': axiom_id, 'status': 'WARN', 'count': count, 'severity': severity or 'SOFT'})
-    
     return results
 
 
@@ -107,7 +389,7 @@ def print_report(results: dict):
     
     # Print ERROR
     for r in results['error']:
-        print(f"[ERROR] {r['axiom_id']}: {r['message']}")
+        print(f"[{r.get('status', 'ERROR')}] {r['axiom_id']}: {r['message']}")
     
     # Print SKIP
     for r in results['skip']:
@@ -126,14 +408,101 @@ def print_report(results: dict):
         f"\nSummary: {len(results['pass'])} PASS, {len(results['warn'])} WARN, {len(results['info'])} INFO, "
         f"{len(results['fail'])} FAIL, {len(results['error'])} ERROR, {len(results['skip'])} SKIP"
     )
+    cached = sum(1 for records in results.values() for r in records if r.get('cached'))
+    if cached:
+        print(f"({cached} results served from the result store: source tables unchanged)")
     print("=" * 50)
     
     # Only HARD failures and execution errors should fail the process
     return len(results['fail']) == 0 and len(results['error']) == 0
 
 
+def report_markdown(results: dict) -> str:
+    """Validation report as a markdown document (one table row per axiom)."""
+    rows = []
+    for bucket in ('fail', 'error', 'warn', 'info', 'pass', 'skip'):
+        for r in results[bucket]:
+            rows.append({
+                'Axiom': r['axiom_id'],
+                'Status': r.get('status', bucket.upper()),
+                'Violations': r['count'] if r.get('count', -1) >= 0 else '',
+                'Severity': r.get('severity', ''),
+                'Time': 'cache' if r.get('cached') else (f"{r['elapsed']:.1f}s" if 'elapsed' in r else ''),
+                'Detail': r.get('message') or r.get('reason') or '',
+            })
+    return "\n".join([
+        "# Axiom Validation Report",
+        f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        render_markdown_table(rows, max_col_width=120),
+        "",
+    ])
+
+
+def print_history(store: AxiomResultStore, axiom_id: str, limit: int = 20):
+    """Print the most recent results of one axiom (violations trend)."""
+    rows = store.history(axiom_id, limit)
+    if not rows:
+        print(f"No recorded results for {axiom_id} in {store.path}")
+        return
+    print(f"History for {axiom_id} (latest first):")
+    for run_at, status, count, elapsed, cached in rows:
+        source = "cache" if cached else f"{elapsed or 0:.1f}s"
+        print(f"  {run_at}  {status:<5} {count:>10}  ({source})")
+
+
+def stamp_last_validated(axioms_path: Path, dates: dict) -> int:
+    """
+    Write `last_validated` dates into AXIOMS.yaml in place.
+
+    Only the `last_validated:` line of each axiom block is rewritten so
+    comments and formatting survive. Returns the number of axioms updated.
+    """
+    lines = axioms_path.read_text(encoding='utf-8').splitlines(keepends=True)
+    current = None
+    updated = 0
+    for i, line in enumerate(lines):
+        match = re.match(r"\s*- id:\s*(\S+)", line)
+        if match:
+            current = match.group(1)
+            continue
+        match = re.match(r"(\s*last_validated:)\s*(.*?)\s*$", line)
+        if match and current in dates and match.group(2) != dates[current]:
+            lines[i] = f"{match.group(1)} {dates[current]}\n"
+            updated += 1
+    if updated:
+        axioms_path.write_text("".join(lines), encoding='utf-8')
+    return updated
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Validate ontology axioms against Snowflake")
+    parser.add_argument("--parallel", type=int, default=4,
+                        help="Axiom queries to run concurrently (default: 4; 1 = sequential)")
+    parser.add_argument("--timeout", type=int, default=None,
+                        help="Per-axiom query timeout in seconds (default: none)")
+    parser.add_argument("--no-fuse", action="store_true",
+                        help="Run every axiom query on its own instead of fusing scans of the same table")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run every axiom even if its query and source tables are unchanged")
+    parser.add_argument("--no-store", action="store_true",
+                        help=f"Neither read nor record results in {RESULT_STORE_PATH.name}")
+    parser.add_argument("--markdown", metavar="PATH",
+                        help="Also write the report as a markdown table to PATH")
+    parser.add_argument("--history", metavar="AXIOM_ID",
+                        help="Print the recorded results of one axiom and exit")
+    parser.add_argument("--stamp", action="store_true",
+                        help="Write last_validated dates from the result store into AXIOMS.yaml")
+    args = parser.parse_args()
+
+    store = None if args.no_store else AxiomResultStore(RESULT_STORE_PATH)
+    if args.history:
+        if store is None:
+            parser.error("--history needs the result store")
+        print_history(store, args.history)
+        return
+
     # Path to AXIOMS.yaml
     axioms_path = project_root / "ontology" / "AXIOMS.yaml"
     
@@ -145,10 +514,22 @@ def main():
     axioms = load_axioms(axioms_path)
     print(f"Found {len(axioms)} axioms to validate")
     
-    print("\nConnecting to Snowflake and running validations...")
-    results = validate_all_axioms(axioms)
+    print(f"\nConnecting to Snowflake and running validations (parallel={args.parallel})...")
+    started = time.perf_counter()
+    results = validate_all_axioms(axioms, parallel=args.parallel, timeout=args.timeout, fuse=not args.no_fuse,
+                                  store=store, force=args.force)
+    print(f"Validation finished in {time.perf_counter() - started:.1f}s")
     
     success = print_report(results)
+    if args.markdown:
+        Path(args.markdown).write_text(report_markdown(results), encoding='utf-8')
+        print(f"Markdown report saved to {args.markdown}")
+
+    if store is not None:
+        if args.stamp:
+            updated = stamp_last_validated(axioms_path, store.last_validated())
+            print(f"Updated last_validated for {updated} axioms in {axioms_path.name}")
+        store.close()
     
     sys.exit(0 if success else 1)
 
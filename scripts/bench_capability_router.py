@@ -0,0 +1,100 @@
+"""
+Benchmark for ontology_graph.router.
+
+1. Accuracy: routes every example_query of CAPABILITY_MATRIX and reports how
+   often its own capability ranks first / in the top 3. The headline number is
+   leave-one-out: each query is routed by a router built without it, so it
+   never matches its own text. The in-index number is only a sanity check.
+2. Latency: replicates the matrix --scale times (distinct capability names
+   and terms per copy) and times route() over all example queries; fails when
+   the mean exceeds --budget-ms.
+
+Usage:
+  python scripts/bench_capability_router.py
+  python scripts/bench_capability_router.py --scale 50 --budget-ms 1
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from ontology_graph import load_sources
+from ontology_graph.router import CapabilityRouter
+
+def example_queries(matrix):
+    return [
+        (query, capability['name'])
+        for domain in matrix.get('domains') or []
+        for capability in domain.get('capabilities') or []
+        for query in capability.get('example_queries') or []
+    ]
+
+def without_query(matrix, query):
+    """Copy of the matrix with one example query removed from every capability listing it."""
+    held_out = copy.deepcopy(matrix)
+    for domain in held_out.get('domains') or []:
+        for capability in domain.get('capabilities') or []:
+            if query in (capability.get('example_queries') or []):
+                capability['example_queries'] = [q for q in capability['example_queries'] if q != query]
+    return held_out
+
+def accuracy(route_for, queries, show_misses=False):
+    """(top1, top3) fractions of queries whose capability ranks first / in the top 3."""
+    top1 = top3 = 0
+    for query, expected in queries:
+        ranked = [r['capability'] for r in route_for(query)]
+        top1 += bool(ranked) and ranked[0] == expected
+        top3 += expected in ranked
+        if show_misses and (not ranked or ranked[0] != expected):
+            print(f"  miss: {query!r} -> {ranked[:3]} (expected {expected})")
+    return top1 / len(queries), top3 / len(queries)
+
+def scaled_matrix(matrix, scale):
+    """`scale` copies of every domain, each with its own capability names and a distinctive term."""
+    domains = []
+    for copy_index in range(scale):
+        for domain in matrix.get('domains') or []:
+            clone = copy.deepcopy(domain)
+            clone['id'] = f"{domain['id']}_{copy_index}"
+            for capability in clone.get('capabilities') or []:
+                capability['name'] = f"{capability['name']}Variant{copy_index}"
+                capability['description'] += f" region{copy_index}"
+            domains.append(clone)
+    return {'domains': domains, 'routing': matrix.get('routing') or {}}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark capability routing accuracy and latency")
+    parser.add_argument("--scale", type=int, default=40, help="Copies of the matrix for the latency test")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the example queries")
+    parser.add_argument("--budget-ms", type=float, default=1.0, help="Max mean route() latency")
+    args = parser.parse_args()
+
+    matrix = load_sources()['capability_matrix']
+    router = CapabilityRouter(matrix)
+    queries = example_queries(matrix)
+    top1, top3 = accuracy(
+        lambda q: CapabilityRouter(without_query(matrix, q)).route(q, limit=3), queries, show_misses=True)
+    print(f"held-out accuracy on {len(queries)} example queries (leave-one-out): top1 {top1:.0%}, top3 {top3:.0%}")
+    top1, top3 = accuracy(lambda q: router.route(q, limit=3), queries)
+    print(f"in-index sanity check (queries are part of the index): top1 {top1:.0%}, top3 {top3:.0%}")
+
+    start = time.perf_counter()
+    big = CapabilityRouter(scaled_matrix(matrix, args.scale))
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for query, _ in queries:
+            big.route(query)
+    mean_ms = (time.perf_counter() - start) * 1000 / (args.repeat * len(queries))
+    print(f"{len(big.docs)} capabilities: index built in {build_ms:.1f} ms, route() mean {mean_ms * 1000:.0f} us")
+
+    if mean_ms > args.budget_ms:
+        print(f"[FAIL] route() mean {mean_ms:.3f} ms exceeds the {args.budget_ms} ms budget.")
+        sys.exit(1)
+    print(f"[OK] route() stays within {args.budget_ms} ms.")
+
+if __name__ == "__main__":
+    main()
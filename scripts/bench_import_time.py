@@ -0,0 +1,86 @@
+"""
+Import-time budget for skill entry points.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`
+and fails when its cumulative import time exceeds the budget, or when a
+heavy dependency (pandas, snowflake.connector, dotenv, pyarrow) is loaded at
+import time instead of on first use.
+
+Usage:
+  python scripts/bench_import_time.py
+  python scripts/bench_import_time.py --budget-ms 150 --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# (module, directory put on sys.path)
+ENTRY_POINTS = [
+    ("snowflake_connection", os.path.join(REPO_ROOT, "src", "utils")),
+    ("validate", os.path.join(REPO_ROOT, ".cursor", "skills", "validate-axioms", "scripts")),
+    ("investigate", os.path.join(REPO_ROOT, ".cursor", "skills", "investigate-entity", "scripts")),
+]
+
+HEAVY_MODULES = ("pandas", "snowflake.connector", "dotenv", "pyarrow")
+
+def import_profile(module, path):
+    """(cumulative microseconds for `module`, set of imported module names)."""
+    code = f"import sys; sys.path.insert(0, {path!r}); import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=REPO_ROOT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    cumulative = None
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        imported.add(name.strip())
+        if name.rstrip() == f" {module}":
+            cumulative = int(cum)
+    return cumulative, imported
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of skill entry points")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Max cumulative import time per entry point")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per entry point (best is kept)")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<22} {'import_ms':>10}  heavy modules loaded")
+    for module, path in ENTRY_POINTS:
+        best = None
+        for _ in range(args.repeat):
+            try:
+                cumulative, imported = import_profile(module, path)
+            except RuntimeError as e:
+                failures.append(str(e))
+                break
+            best = cumulative if best is None else min(best, cumulative)
+        if best is None:
+            continue
+
+        heavy = sorted(m for m in HEAVY_MODULES if m in imported)
+        print(f"{module:<22} {best / 1000:10.1f}  {', '.join(heavy) or '-'}")
+        if best / 1000 > args.budget_ms:
+            failures.append(f"{module}: {best / 1000:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        if heavy:
+            failures.append(f"{module}: imports {', '.join(heavy)} at load time")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+        sys.exit(1)
+    print(f"\n[OK] All entry points import within {args.budget_ms:.0f} ms without heavy dependencies.")
+
+if __name__ == "__main__":
+    main()
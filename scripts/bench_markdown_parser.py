@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for ontology_markdown.parse_markdown.
+
+Parses synthetic ontology docs of growing size (default up to 10 MB) and
+checks that time per MB stays flat, i.e. the parser is linear.
+
+Usage:
+  python scripts/bench_markdown_parser.py
+  python scripts/bench_markdown_parser.py --sizes 1 5 10 --legacy
+"""
+
+import argparse
+import re
+import sys
+import time
+
+from ontology_markdown import parse_markdown
+
+BLOCK = """## 3. Regras de Negócio
+
+> [!DANGER] Nunca agregar risk_score com códigos especiais (-1, 9).
+> Use risk_capim_0_5.
+
+### 3.1. Elegibilidade BNPL
+Uma simulação só pode ser aprovada se a clínica for elegível.
+| coluna | tipo | descrição |
+|---|---|---|
+| clinic_id | NUMBER | chave mestre |
+
+> [!NOTE]
+> Snapshot de elegibilidade, não as-of.
+
+### 3.2. Janela SCR
+Associação via janela de +/- 15 dias entre C1 e checked_at.
+Texto corrido de exemplo para dar volume ao documento sem novos marcadores.
+
+"""
+
+HEADER = "# ENTITY_SEMANTIC\n\nCreated: 2026-01-01\nLast Updated: 2026-02-01\n\n"
+
+def make_doc(size_mb):
+    target = int(size_mb * 1024 * 1024)
+    repeats = max(1, target // len(BLOCK.encode('utf-8')))
+    return HEADER + BLOCK * repeats
+
+def legacy_parse(content):
+    """The regex implementation parse_markdown replaced (three scans per doc)."""
+    axioms = []
+    for type_str, msg in re.findall(r'> \[!(.*?)\]\s*(.*?)(?=\n>|\n\n|\n#|$)', content, re.DOTALL):
+        axioms.append((type_str, msg))
+    for title, desc in re.findall(r'### \d+\.\d+\. (.*?)\n(.*?)(?=\n###|\n##|\n#|$)', content, re.DOTALL):
+        axioms.append((title, desc))
+    for line in content.split('\n'):
+        if 'Last Updated:' in line or 'Created:' in line:
+            pass
+    return axioms
+
+def best_of(fn, arg, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass markdown parser")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 2.5, 5, 10], help="Doc sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Max allowed ratio between the slowest and fastest time per MB")
+    parser.add_argument("--legacy", action="store_true", help="Also time the old regex implementation")
+    args = parser.parse_args()
+
+    per_mb = []
+    print(f"{'size_mb':>8} {'axioms':>8} {'seconds':>9} {'s/MB':>8}" + (f" {'legacy_s':>9}" if args.legacy else ""))
+    for size in args.sizes:
+        doc = make_doc(size)
+        actual_mb = len(doc.encode('utf-8')) / (1024 * 1024)
+        axioms, _, _ = parse_markdown(doc)
+        elapsed = best_of(parse_markdown, doc, args.repeat)
+        per_mb.append(elapsed / actual_mb)
+        line = f"{actual_mb:8.2f} {len(axioms):8d} {elapsed:9.3f} {elapsed / actual_mb:8.3f}"
+        if args.legacy:
+            line += f" {best_of(legacy_parse, doc, 1):9.3f}"
+        print(line)
+
+    ratio = max(per_mb) / min(per_mb)
+    print(f"\nTime-per-MB spread: {ratio:.2f}x (tolerance {args.tolerance}x)")
+    if ratio > args.tolerance:
+        print("[FAIL] Parser does not scale linearly with document size.")
+        sys.exit(1)
+    print("[OK] Parser scales linearly.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Micro-benchmark for ontology_graph lookups.
+
+Answers the same questions with the compiled OntologyGraph and with the naive
+walk over the parsed YAML lists (what scripts did before), checks both agree,
+and fails unless the graph is at least --min-speedup times faster. The one-off
+parse, snapshot load and compile costs are reported separately.
+
+Usage:
+  python scripts/bench_ontology_graph.py
+  python scripts/bench_ontology_graph.py --iterations 20000 --min-speedup 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Mapping
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from ontology_graph import build_graph, load_sources, parse_sources
+from ontology_graph.graph import axiom_tables
+
+# --- Naive walks over the parsed YAML --------------------------------------
+
+def naive_instances_under(sources, class_name):
+    classes = sources['taxonomy'].get('classes') or []
+    by_name = {c['name']: c for c in classes}
+    found, stack = [], [class_name]
+    members = set()
+    while stack:
+        name = stack.pop()
+        members.add(name)
+        # children may name classes that are not defined yet (e.g. CHAT)
+        stack.extend(by_name.get(name, {}).get('children') or [])
+    for cls in classes:
+        if cls['name'] in members:
+            found.extend(cls.get('instances') or [])
+    return tuple(found)
+
+def naive_ancestors(sources, class_name):
+    classes = sources['taxonomy'].get('classes') or []
+    chain, current = [], class_name
+    while True:
+        parent = next((c.get('parent') for c in classes if c['name'] == current), None)
+        if parent is None:
+            return tuple(chain)
+        chain.append(parent)
+        current = parent
+
+def naive_bridges_for(sources, entity):
+    return tuple(
+        b for b in sources['glue'].get('intersections') or []
+        if entity in (b.get('source'), b.get('target'))
+    )
+
+def naive_capabilities(sources, domain):
+    for d in sources['capability_matrix'].get('domains') or []:
+        if d.get('id') == domain:
+            return tuple(d.get('capabilities') or [])
+    return ()
+
+def naive_axioms_for_table(sources, table):
+    return tuple(
+        a for a in sources['axioms'].get('axioms') or []
+        if table in axiom_tables(a.get('validation_query'))
+    )
+
+# --- Benchmark -------------------------------------------------------------
+
+def thaw(value):
+    """Graph records (read-only mappings, tuples) as plain dicts/lists, to compare with parsed YAML."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+def workload(sources):
+    """(label, keys, naive lookup, graph lookup, normaliser applied before comparing)."""
+    classes = [c['name'] for c in sources['taxonomy'].get('classes') or []]
+    entities = sorted({e for b in sources['glue'].get('intersections') or [] for e in (b['source'], b['target'])})
+    domains = [d['id'] for d in sources['capability_matrix'].get('domains') or []]
+    tables = sorted({t for a in sources['axioms'].get('axioms') or [] for t in axiom_tables(a.get('validation_query'))})
+    names = lambda records: tuple(r.get('name') or r.get('id') for r in records)
+    return [
+        ("instances_under", classes,
+         lambda g, c: naive_instances_under(sources, c), lambda g, c: g.instances_under(c), tuple),
+        ("ancestors", classes,
+         lambda g, c: naive_ancestors(sources, c), lambda g, c: g.ancestors(c), tuple),
+        ("bridges_for", entities,
+         lambda g, e: naive_bridges_for(sources, e), lambda g, e: g.bridges_for(e), thaw),
+        ("capabilities", domains,
+         lambda g, d: naive_capabilities(sources, d), lambda g, d: g.capabilities(d), names),
+        ("axioms_for_table", tables,
+         lambda g, t: naive_axioms_for_table(sources, t), lambda g, t: g.axioms_for_table(t), names),
+    ]
+
+def time_lookups(fn, graph, keys, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for key in keys:
+            fn(graph, key)
+    return (time.perf_counter() - start) / (iterations * max(len(keys), 1))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OntologyGraph lookups against naive YAML walks")
+    parser.add_argument("--iterations", type=int, default=2000, help="Passes over every key per query type")
+    parser.add_argument("--min-speedup", type=float, default=5.0, help="Required overall speedup over the naive walk")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sources = parse_sources()
+    parse_s = time.perf_counter() - start
+    load_sources()  # make sure the snapshot is fresh before timing it
+    start = time.perf_counter()
+    snapshot = load_sources()
+    snapshot_s = time.perf_counter() - start
+    if snapshot != sources:
+        print("[FAIL] Snapshot contents differ from the parsed YAML.")
+        sys.exit(1)
+    start = time.perf_counter()
+    graph = build_graph(sources)
+    build_s = time.perf_counter() - start
+    print(f"parse YAML: {parse_s * 1000:.1f} ms   snapshot load: {snapshot_s * 1000:.2f} ms   "
+          f"compile graph: {build_s * 1000:.2f} ms   {graph!r}\n")
+
+    print(f"{'query':<18} {'keys':>5} {'naive_us':>9} {'graph_us':>9} {'speedup':>8}")
+    total_naive = total_graph = 0.0
+    for label, keys, naive, indexed, normalise in workload(sources):
+        for key in keys:
+            expected, got = normalise(naive(graph, key)), normalise(indexed(graph, key))
+            if expected != got:
+                print(f"[FAIL] {label}({key!r}) differs: {expected} != {got}")
+                sys.exit(1)
+        naive_s = time_lookups(naive, graph, keys, args.iterations)
+        graph_s = time_lookups(indexed, graph, keys, args.iterations)
+        total_naive += naive_s
+        total_graph += graph_s
+        print(f"{label:<18} {len(keys):5d} {naive_s * 1e6:9.2f} {graph_s * 1e6:9.2f} {naive_s / graph_s:7.1f}x")
+
+    speedup = total_naive / total_graph
+    if speedup < args.min_speedup:
+        print(f"\n[FAIL] Overall speedup {speedup:.1f}x below the required {args.min_speedup}x.")
+        sys.exit(1)
+    print(f"\n[OK] Indexed lookups are {speedup:.1f}x faster than the naive walk.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark for ontology_graph.RuleExecutor.
+
+Runs an inference rule (default RULE-CROSS-001, the clinic health diagnostic)
+with simulated capability handlers that sleep for a fixed latency each, once
+one action at a time and once in parallel. Checks that the parallel run costs
+about the slowest leg rather than the sum, and that a second rule sharing
+capability calls within the session (RULE-SAAS-001) is served from the memo.
+
+Usage:
+  python scripts/bench_rule_executor.py
+  python scripts/bench_rule_executor.py --rule RULE-CROSS-002 --latency-ms 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from ontology_graph import RuleExecutor, load_graph
+from utils.markdown_table import render_markdown_table
+
+CONTEXT = {"resolved_clinic_id": 12345, "resolved_date_range": "last_90_days", "resolved_cpf": "12345678900"}
+
+def simulated_handlers(graph, latency_s):
+    """One sleeping handler per capability, plus RETRIEVE."""
+    def make(name):
+        def handler(**params):
+            time.sleep(latency_s)
+            return {"capability": name, "params": params}
+        return handler
+    handlers = {name: make(name) for name in graph.capabilities_by_name}
+    handlers["RETRIEVE"] = make("RETRIEVE")
+    return handlers
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel inference-rule execution")
+    parser.add_argument("--rule", default="RULE-CROSS-001", help="Rule to execute")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Simulated latency of every capability call")
+    parser.add_argument("--then", default="RULE-SAAS-001", help="Second rule run in the same session (memo check)")
+    args = parser.parse_args()
+
+    graph = load_graph()
+    handlers = simulated_handlers(graph, args.latency_ms / 1000)
+
+    with RuleExecutor(handlers, graph=graph) as executor:
+        serial = executor.run(args.rule, CONTEXT, parallel=False)
+    with RuleExecutor(handlers, graph=graph) as executor:
+        parallel = executor.run(args.rule, CONTEXT)
+        follow_up = executor.run(args.then, CONTEXT) if args.then else None
+
+    print(render_markdown_table([
+        {k: (f"{v * 1000:.1f}" if k == 'elapsed' and v is not None else v) for k, v in record.items()}
+        for record in parallel['actions']
+    ], columns=['output_key', 'domain', 'handler', 'status', 'elapsed', 'cached']))
+    print(f"\n{args.rule}: serial {serial['elapsed'] * 1000:.0f} ms, parallel {parallel['elapsed'] * 1000:.0f} ms "
+          f"({len(parallel['actions'])} actions, {args.latency_ms:.0f} ms each)")
+
+    failures = []
+    if any(r['status'] != 'OK' for r in parallel['actions']):
+        failures.append("some actions did not succeed")
+    slowest = max(r['elapsed'] for r in parallel['actions'])
+    if parallel['elapsed'] > slowest * 1.5 + 0.01:
+        failures.append(f"parallel run took {parallel['elapsed'] * 1000:.0f} ms, slowest leg {slowest * 1000:.0f} ms")
+    if follow_up:
+        hits = sum(r['cached'] for r in follow_up['actions'])
+        print(f"{args.then} in the same session: {follow_up['elapsed'] * 1000:.0f} ms, {hits} memoized action(s)")
+
+    if failures:
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+        sys.exit(1)
+    print(f"[OK] Parallel execution is {serial['elapsed'] / parallel['elapsed']:.1f}x faster than serial.")
+
+if __name__ == "__main__":
+    main()
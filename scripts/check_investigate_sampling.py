@@ -0,0 +1,80 @@
+"""
+Regression check for sampled profiling in investigate-entity.
+
+Profiles a simulated table wider than PROFILE_COLUMNS_PER_QUERY with
+run_query mocked, so the stats are split across several queries. Over a
+SAMPLE each query draws its own sample, and the mock makes each batch return
+a different row count. Checks that every column's nulls, Wilson interval and
+estimate are computed against its own batch's row count (the report used to
+mix them up and crash on negative null counts).
+
+Usage:
+  python scripts/check_investigate_sampling.py
+  python scripts/check_investigate_sampling.py --columns 400
+"""
+
+import argparse
+import os
+import re
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                '.cursor', 'skills', 'investigate-entity', 'scripts'))
+import investigate
+
+TABLE = "DB.SCHEMA.WIDE_TABLE"
+TABLE_ROWS = 100_000
+NULLS = 50
+
+def fake_run_query(query, **kwargs):
+    """Stats batch j reads 1000 - 100*j rows with NULLS nulls per column; metadata has TABLE_ROWS."""
+    if "INFORMATION_SCHEMA.TABLES" in query:
+        return pd.DataFrame([{"ROW_COUNT": TABLE_ROWS, "TABLE_TYPE": "BASE TABLE"}])
+    batch = re.search(r"COUNT\(\*\) AS B(\d+)_ROWS", query)
+    if not batch:
+        return None
+    rows = 1000 - 100 * int(batch.group(1))
+    row = {f"B{batch.group(1)}_ROWS": rows}
+    for alias in re.findall(r"AS (C\d+_\w+)", query):
+        row[alias] = rows - NULLS if alias.endswith("_NN") else 1
+    return pd.DataFrame([row])
+
+def main():
+    parser = argparse.ArgumentParser(description="Check sampled profiling of tables split into several stats queries")
+    parser.add_argument("--columns", type=int, default=200, help="Width of the simulated table")
+    args = parser.parse_args()
+
+    schema_df = pd.DataFrame({
+        "COLUMN_NAME": [f"COL_{i}" for i in range(args.columns)],
+        "DATA_TYPE": ["TEXT"] * args.columns,
+        "IS_NULLABLE": ["YES"] * args.columns,
+    })
+    investigate.run_query = fake_run_query
+    failures = []
+    for label, kwargs in (("bernoulli 1%", dict(sample_percent=1.0)),
+                          ("system 1%", dict(sample_percent=1.0, sample_method="SYSTEM")),
+                          ("1000 rows", dict(sample_rows=1000))):
+        try:
+            report_md, summary = investigate.profile_table(TABLE, schema_df, **kwargs)
+        except Exception as e:
+            failures.append(f"{label}: {type(e).__name__}: {e}")
+            continue
+        for i in range(args.columns):
+            rows = 1000 - 100 * (i // investigate.PROFILE_COLUMNS_PER_QUERY)
+            expected = f"| COL_{i} | ~{round(NULLS * TABLE_ROWS / rows):,} | {NULLS / rows * 100:.2f}% ["
+            if expected not in report_md:
+                failures.append(f"{label}: COL_{i} not measured against its batch's {rows} rows")
+                break
+        if summary['rows'] != TABLE_ROWS:
+            failures.append(f"{label}: total rows {summary['rows']} != metadata {TABLE_ROWS}")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"[OK] Sampled profiling of {args.columns} columns uses each stats query's own row count.")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import psycopg2
 from dotenv import load_dotenv
+import argparse
 import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from utils.markdown_table import render_markdown_table
+from governance_rules import DEFAULT_RULES_PATH, evaluate_rules, load_rules, profile_rules
+
 load_dotenv()
 
 def _get_vox_popular_pg_config():
@@ -35,24 +40,39 @@ def _get_vox_popular_pg_config():
         "password": password,
     }
 
-def check():
-    conn = psycopg2.connect(**_get_vox_popular_pg_config())
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT qualified_name, domains, tier, status
+# Doc coverage per source domain and tier, plus ROLLUP subtotals, in one pass.
+SUMMARY_SQL = """
+    WITH e AS (
+        SELECT
+          COALESCE(metadata->>'source_domain', 'unknown') AS source_domain,
+          tier,
+          (semantic_markdown IS NULL OR LENGTH(TRIM(semantic_markdown)) = 0) AS missing_semantic,
+          (agentic_markdown IS NULL OR LENGTH(TRIM(agentic_markdown)) = 0) AS missing_agentic
         FROM public.ontology_entities
-        ORDER BY qualified_name;
-        """
     )
-    rows = cursor.fetchall()
-    print(f"[CHECK] Rows in ontology_entities: {len(rows)}")
-    for row in rows:
-        print(f"   - {row[0]} | Domains: {row[1]} | Tier: {row[2]} | Status: {row[3]}")
-
-    cursor.execute(
-        """
+    SELECT
+      source_domain,
+      tier,
+      GROUPING(source_domain, tier) AS rollup_level,
+      COUNT(*) AS entities,
+      COUNT(*) FILTER (WHERE missing_semantic AND missing_agentic) AS missing_both,
+      COUNT(*) FILTER (WHERE missing_semantic AND NOT missing_agentic) AS missing_semantic_only,
+      COUNT(*) FILTER (WHERE missing_agentic AND NOT missing_semantic) AS missing_agentic_only
+    FROM e
+    GROUP BY ROLLUP (source_domain, tier)
+    ORDER BY rollup_level, source_domain, tier;
+"""
+
+# Per-entity detail for --verbose, grouped by missing-doc class.
+MISSING_DETAIL_SQL = """
+    SELECT
+      CASE
+        WHEN missing_semantic AND missing_agentic THEN 'Sem SEMANTIC e AGENTIC'
+        WHEN missing_semantic THEN 'Sem SEMANTIC'
+        ELSE 'Sem AGENTIC'
+      END AS missing_class,
+      qualified_name, domains, tier, status, source_domain, semantic_path, agentic_path
+    FROM (
         SELECT
           qualified_name,
           domains,
@@ -64,89 +84,109 @@ def check():
           (semantic_markdown IS NULL OR LENGTH(TRIM(semantic_markdown)) = 0) AS missing_semantic,
           (agentic_markdown IS NULL OR LENGTH(TRIM(agentic_markdown)) = 0) AS missing_agentic
         FROM public.ontology_entities
-        WHERE
-          (semantic_markdown IS NULL OR LENGTH(TRIM(semantic_markdown)) = 0)
-          OR (agentic_markdown IS NULL OR LENGTH(TRIM(agentic_markdown)) = 0)
-        ORDER BY qualified_name;
-        """
-    )
-    missing = cursor.fetchall()
+    ) flags
+    WHERE missing_semantic OR missing_agentic
+    ORDER BY missing_class, qualified_name;
+"""
+
+def print_missing_detail(conn, itersize=500):
+    """Stream missing-doc entities through a server-side cursor (never loaded all at once)."""
+    with conn.cursor(name="check_sync_missing_detail") as cursor:
+        cursor.itersize = itersize
+        cursor.execute(MISSING_DETAIL_SQL)
+        current_class = None
+        for missing_class, qualified_name, domains, tier, status, source_domain, sem_path, age_path in cursor:
+            if missing_class != current_class:
+                print(f"[CHECK] - {missing_class}:")
+                current_class = missing_class
+            print(f"   - {qualified_name} | DomainSrc: {source_domain} | Domains: {domains} | Tier: {tier} | Status: {status}")
+            print(f"     semantic_path: {sem_path or '<empty>'}")
+            print(f"     agentic_path:  {age_path or '<empty>'}")
+
+def check(verbose=False, rules_path=DEFAULT_RULES_PATH, profile=False):
+    conn = psycopg2.connect(**_get_vox_popular_pg_config())
+    cursor = conn.cursor()
+
+    cursor.execute(SUMMARY_SQL)
+    summary = cursor.fetchall()
+    # ROLLUP level 3 is the grand total; absent when the table is empty
+    totals = next((row for row in summary if row[2] == 3), (None, None, 3, 0, 0, 0, 0))
+    _, _, _, total, missing_both, missing_semantic_only, missing_agentic_only = totals
+    missing = missing_both + missing_semantic_only + missing_agentic_only
+
+    print(f"[CHECK] Rows in ontology_entities: {total}")
+    breakdown = [
+        {
+            "source_domain": domain if level < 2 else "(all)",
+            "tier": tier if level == 0 else "(all)",
+            "entities": entities,
+            "missing_both": both,
+            "missing_semantic": sem_only,
+            "missing_agentic": age_only,
+        }
+        for domain, tier, level, entities, both, sem_only, age_only in summary
+        if level < 3
+    ]
+    print(render_markdown_table(breakdown))
 
     if not missing:
         print("[CHECK] OK: todas as entidades possuem semantic_markdown e agentic_markdown não vazios.")
     else:
-        missing_semantic_only = []
-        missing_agentic_only = []
-        missing_both = []
-
-        for qualified_name, domains, tier, status, source_domain, sem_path, age_path, ms, ma in missing:
-            item = (qualified_name, domains, tier, status, source_domain, sem_path, age_path)
-            if ms and ma:
-                missing_both.append(item)
-            elif ms:
-                missing_semantic_only.append(item)
-            elif ma:
-                missing_agentic_only.append(item)
-
-        print(f"[CHECK] ATENÇÃO: entidades com docs faltando: {len(missing)}")
-        if missing_both:
-            print(f"[CHECK] - Sem SEMANTIC e AGENTIC: {len(missing_both)}")
-            for qualified_name, domains, tier, status, source_domain, sem_path, age_path in missing_both:
-                print(f"   - {qualified_name} | DomainSrc: {source_domain} | Domains: {domains} | Tier: {tier} | Status: {status}")
-                print(f"     semantic_path: {sem_path or '<empty>'}")
-                print(f"     agentic_path:  {age_path or '<empty>'}")
-        if missing_semantic_only:
-            print(f"[CHECK] - Sem SEMANTIC: {len(missing_semantic_only)}")
-            for qualified_name, domains, tier, status, source_domain, sem_path, age_path in missing_semantic_only:
-                print(f"   - {qualified_name} | DomainSrc: {source_domain} | Domains: {domains} | Tier: {tier} | Status: {status}")
-                print(f"     semantic_path: {sem_path or '<empty>'}")
-                print(f"     agentic_path:  {age_path or '<empty>'}")
-        if missing_agentic_only:
-            print(f"[CHECK] - Sem AGENTIC: {len(missing_agentic_only)}")
-            for qualified_name, domains, tier, status, source_domain, sem_path, age_path in missing_agentic_only:
-                print(f"   - {qualified_name} | DomainSrc: {source_domain} | Domains: {domains} | Tier: {tier} | Status: {status}")
-                print(f"     semantic_path: {sem_path or '<empty>'}")
-                print(f"     agentic_path:  {age_path or '<empty>'}")
+        print(f"[CHECK] ATENÇÃO: entidades com docs faltando: {missing}")
+        for label, count in (
+            ("Sem SEMANTIC e AGENTIC", missing_both),
+            ("Sem SEMANTIC", missing_semantic_only),
+            ("Sem AGENTIC", missing_agentic_only),
+        ):
+            if count:
+                print(f"[CHECK] - {label}: {count}")
+        if verbose:
+            print_missing_detail(conn)
+        else:
+            print("[CHECK] Use --verbose para listar as entidades.")
 
     # --- Governance checks (strict) ---
-    # Ensure ECOSYSTEM.CLINICS is SAAS-owned (canonical minimum contract).
-    cursor.execute(
-        """
-        SELECT
-          qualified_name,
-          COALESCE(metadata->>'source_domain', '') AS source_domain,
-          COALESCE(metadata->'original_paths'->>'semantic', '') AS semantic_path,
-          COALESCE(metadata->'original_paths'->>'agentic', '') AS agentic_path
-        FROM public.ontology_entities
-        WHERE qualified_name = 'ECOSYSTEM.CLINICS';
-        """
-    )
-    row = cursor.fetchone()
-    governance_violations = []
-
-    if row is None:
-        governance_violations.append("ECOSYSTEM.CLINICS não encontrado em public.ontology_entities.")
-    else:
-        qualified_name, source_domain, sem_path, age_path = row
-        if source_domain != "SAAS":
-            governance_violations.append(
-                "Governança violada: ECOSYSTEM.CLINICS deve ser SAAS-owned, "
-                f"mas metadata.source_domain={source_domain!r}. "
-                f"(semantic_path={sem_path!r}, agentic_path={age_path!r})"
-            )
-
-    if governance_violations:
-        print("[CHECK] ERRO: violações de governança detectadas:")
-        for msg in governance_violations:
-            print(f"   - {msg}")
-        cursor.close()
-        conn.close()
-        sys.exit(1)
+    # Declarative rules (federation/GOVERNANCE_RULES.yaml), all checked in one query.
+    rules = load_rules(rules_path)
+    if profile:
+        results, elapsed = profile_rules(cursor, rules)
+        print(f"[CHECK] Governança: {len(rules)} regras, uma query por regra (--profile-rules, {elapsed * 1000:.1f} ms)")
     else:
-        print("[CHECK] OK: governança ECOSYSTEM.CLINICS (SAAS-owned) verificada.")
+        results, elapsed = evaluate_rules(cursor, rules)
+        print(f"[CHECK] Governança: {len(rules)} regras em 1 query ({elapsed * 1000:.1f} ms)")
+
+    governance_errors = 0
+    for result in results:
+        rule = result['rule']
+        timing = f" [{result['elapsed'] * 1000:.1f} ms]" if result['elapsed'] is not None else ""
+        if result['passed']:
+            print(f"   - [OK] {rule['id']}: {rule.get('description', '')} ({result['matched']} no escopo){timing}")
+            continue
+        label = "ERRO" if rule['severity'] == 'error' else "WARN"
+        governance_errors += rule['severity'] == 'error'
+        if result['violations']:
+            detail = f"{result['violations']} violações: " + ", ".join(result['examples'])
+            if result['violations'] > len(result['examples']):
+                detail += ", ..."
+        else:
+            detail = "nenhuma entidade no escopo"
+        print(f"   - [{label}] {rule['id']}: {rule.get('description', '')} {detail}{timing}")
 
     cursor.close()
     conn.close()
 
+    if governance_errors:
+        print(f"[CHECK] ERRO: {governance_errors} regra(s) de governança violada(s).")
+        sys.exit(1)
+    print("[CHECK] OK: governança verificada.")
+
 if __name__ == "__main__":
-    check()
+    parser = argparse.ArgumentParser(description="Check ontology_entities sync health in Vox Popular")
+    parser.add_argument("--verbose", action="store_true",
+                        help="List every entity with missing docs (streamed with a server-side cursor)")
+    parser.add_argument("--rules", default=DEFAULT_RULES_PATH,
+                        help="Governance rules YAML (default: federation/GOVERNANCE_RULES.yaml)")
+    parser.add_argument("--profile-rules", action="store_true",
+                        help="Run each governance rule on its own to time it individually")
+    args = parser.parse_args()
+    check(verbose=args.verbose, rules_path=args.rules, profile=args.profile_rules)
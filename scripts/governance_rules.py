@@ -0,0 +1,175 @@
+"""
+Declarative governance rules for public.ontology_entities.
+
+Rules live in federation/GOVERNANCE_RULES.yaml (format documented there).
+compile_rules() turns the whole rule set into ONE SELECT with a FILTER
+aggregate per rule, so every rule is checked in a single table scan and a
+single round trip. Used by check_sync.py.
+"""
+
+import os
+import time
+
+import yaml
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'federation', 'GOVERNANCE_RULES.yaml')
+
+SEVERITIES = ('error', 'warn')
+DOC_COLUMNS = {
+    'semantic': 'semantic_markdown',
+    'agentic': 'agentic_markdown',
+}
+# Violating entities listed per rule
+MAX_EXAMPLES = 5
+
+def _doc_missing(doc):
+    column = DOC_COLUMNS[doc]
+    return f"({column} IS NULL OR LENGTH(TRIM({column})) = 0)"
+
+def _compile_scope(rule):
+    """(SQL predicate, params) selecting the entities a rule applies to."""
+    scope = rule.get('scope') or {}
+    clauses, params = [], []
+    for field, value in scope.items():
+        if field == 'qualified_name':
+            clauses.append("qualified_name = %s")
+        elif field == 'qualified_name_like':
+            clauses.append("qualified_name LIKE %s")
+        elif field == 'domain':
+            clauses.append("%s = ANY(domains)")
+        elif field == 'source_domain':
+            clauses.append("COALESCE(metadata->>'source_domain', '') = %s")
+        elif field == 'tier':
+            clauses.append("tier = %s")
+        elif field == 'has_tier':
+            # tier is nullable: entities without one are only in scope when asked for
+            clauses.append("tier IS NOT NULL" if value else "tier IS NULL")
+            continue
+        else:
+            raise ValueError(f"{rule['id']}: unknown scope field {field!r}")
+        params.append(value)
+    return (" AND ".join(clauses) or "TRUE"), params
+
+def _compile_check(rule):
+    """(condition that must hold, params, SQL text describing a violation)."""
+    rule_type = rule.get('type')
+    if rule_type == 'ownership':
+        if not rule.get('owner'):
+            raise ValueError(f"{rule['id']}: ownership rules need an owner")
+        return (
+            "COALESCE(metadata->>'source_domain', '') = %s",
+            [rule['owner']],
+            "'source_domain=' || COALESCE(metadata->>'source_domain', '<none>')",
+        )
+    if rule_type == 'required_docs':
+        docs = rule.get('docs') or list(DOC_COLUMNS)
+        unknown = [d for d in docs if d not in DOC_COLUMNS]
+        if unknown:
+            raise ValueError(f"{rule['id']}: unknown docs {unknown} (expected {list(DOC_COLUMNS)})")
+        return (
+            "NOT (" + " OR ".join(_doc_missing(d) for d in docs) + ")",
+            [],
+            "CONCAT_WS(', ', " + ", ".join(f"CASE WHEN {_doc_missing(d)} THEN 'no {d}' END" for d in docs) + ")",
+        )
+    if rule_type == 'tier':
+        bounds, params = [], []
+        if rule.get('min_tier') is not None:
+            bounds.append("tier >= %s")
+            params.append(rule['min_tier'])
+        if rule.get('max_tier') is not None:
+            bounds.append("tier <= %s")
+            params.append(rule['max_tier'])
+        if not bounds:
+            raise ValueError(f"{rule['id']}: tier rules need min_tier and/or max_tier")
+        return " AND ".join(bounds), params, "'tier=' || COALESCE(tier::text, 'NULL')"
+    raise ValueError(f"{rule.get('id', '<no id>')}: unknown rule type {rule_type!r}")
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """Rules from YAML, validated (and compiled once) so mistakes fail before querying."""
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = (yaml.safe_load(f) or {}).get('rules') or []
+    seen = set()
+    for rule in rules:
+        if not rule.get('id'):
+            raise ValueError(f"Governance rule without id in {path}: {rule}")
+        if rule['id'] in seen:
+            raise ValueError(f"Duplicate governance rule id {rule['id']} in {path}")
+        seen.add(rule['id'])
+        rule.setdefault('severity', 'error')
+        if rule['severity'] not in SEVERITIES:
+            raise ValueError(f"{rule['id']}: severity must be one of {SEVERITIES}")
+        _compile_scope(rule)
+        _compile_check(rule)
+    return rules
+
+def _rule_aggregates(index, rule):
+    """SELECT-list fragments and params for one rule (matched, violations, examples)."""
+    scope, scope_params = _compile_scope(rule)
+    condition, check_params, detail = _compile_check(rule)
+    violating = f"({scope}) AND NOT COALESCE(({condition}), FALSE)"
+    violating_params = scope_params + check_params
+    exprs = [
+        f"COUNT(*) FILTER (WHERE {scope}) AS r{index}_matched",
+        f"COUNT(*) FILTER (WHERE {violating}) AS r{index}_violations",
+        f"(ARRAY_AGG(qualified_name || ' [' || {detail} || ']' ORDER BY qualified_name) "
+        f"FILTER (WHERE {violating}))[1:{MAX_EXAMPLES}] AS r{index}_examples",
+    ]
+    return exprs, scope_params + violating_params + violating_params
+
+def compile_rules(rules):
+    """(sql, params): every rule as FILTER aggregates of one SELECT over ontology_entities."""
+    exprs, params = [], []
+    for index, rule in enumerate(rules):
+        rule_exprs, rule_params = _rule_aggregates(index, rule)
+        exprs.extend(rule_exprs)
+        params.extend(rule_params)
+    sql = "SELECT\n  " + ",\n  ".join(exprs) + "\nFROM public.ontology_entities;"
+    return sql, params
+
+def _outcomes(rules, row):
+    results = []
+    for index, rule in enumerate(rules):
+        matched, violations, examples = row[3 * index:3 * index + 3]
+        failed = violations > 0 or (rule.get('require_match') and matched == 0)
+        results.append({
+            'rule': rule,
+            'matched': matched,
+            'violations': violations,
+            'examples': examples or [],
+            'passed': not failed,
+            'elapsed': None,
+        })
+    return results
+
+def evaluate_rules(cursor, rules):
+    """
+    Check every rule with one batched query.
+
+    Returns (results, elapsed seconds of the batched query). Each result has
+    rule, matched, violations, examples, passed and elapsed (None: the rules
+    share the single query's time).
+    """
+    if not rules:
+        return [], 0.0
+    sql, params = compile_rules(rules)
+    started = time.perf_counter()
+    cursor.execute(sql, params)
+    row = cursor.fetchone()
+    elapsed = time.perf_counter() - started
+    return _outcomes(rules, row), elapsed
+
+def profile_rules(cursor, rules):
+    """
+    Diagnostic mode: run each rule on its own to measure its individual cost.
+    Same results as evaluate_rules, with 'elapsed' set per rule.
+    """
+    results = []
+    for rule in rules:
+        sql, params = compile_rules([rule])
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+        outcome = _outcomes([rule], row)[0]
+        outcome['elapsed'] = time.perf_counter() - started
+        results.append(outcome)
+    return results, sum(r['elapsed'] for r in results)
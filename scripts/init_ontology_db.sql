@@ -44,3 +44,86 @@ ALTER TABLE public.ontology_entities
       ELSE axioms_json::jsonb
     END
   );
+
+-- Registry position of the domain the row's docs come from. When several
+-- domains declare an entity, the earliest-ranked one (the canonical owner)
+-- provides docs, axioms, status and metadata.source_domain, whatever the
+-- order in which domains were synced.
+ALTER TABLE public.ontology_entities ADD COLUMN IF NOT EXISTS source_rank INTEGER;
+
+-- --- ECOSYSTEM contributions (one row per contributing domain) ---
+-- ECOSYSTEM entities are declared by several domains. Each domain's docs are
+-- stored here, keyed by source_domain and hash-gated, instead of being
+-- appended to ontology_entities.semantic_markdown on every sync.
+
+CREATE TABLE IF NOT EXISTS public.ontology_entity_sources (
+    qualified_name      TEXT NOT NULL REFERENCES public.ontology_entities (qualified_name) ON DELETE CASCADE,
+    source_domain       TEXT NOT NULL,
+    source_rank         INTEGER NOT NULL DEFAULT 0,
+    semantic_markdown   TEXT,
+    agentic_markdown    TEXT,
+    axioms_json         JSONB DEFAULT '[]'::jsonb,
+    sync_hash           TEXT,
+    synced_at           TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (qualified_name, source_domain)
+);
+
+COMMENT ON TABLE public.ontology_entity_sources IS 'Per-domain contributions to shared ECOSYSTEM entities (merged on read by ontology_entities_merged).';
+
+-- Entities as consumers should read them: ECOSYSTEM docs concatenated per
+-- source domain (registry order) and axioms de-duplicated across sources.
+CREATE OR REPLACE VIEW public.ontology_entities_merged AS
+SELECT
+    e.qualified_name,
+    e.domains,
+    e.tier,
+    COALESCE(src.semantic_markdown, e.semantic_markdown) AS semantic_markdown,
+    COALESCE(src.agentic_markdown, e.agentic_markdown) AS agentic_markdown,
+    COALESCE(src.axioms_json, e.axioms_json) AS axioms_json,
+    e.status,
+    e.metadata,
+    e.sync_hash,
+    e.created_at,
+    e.updated_at,
+    e.synced_at
+FROM public.ontology_entities e
+LEFT JOIN LATERAL (
+    SELECT
+        (
+            SELECT STRING_AGG(
+                CASE
+                    WHEN s.pos = 1 THEN s.semantic_markdown
+                    ELSE E'\n\n--- [Merged from ' || s.source_domain || E'] ---\n\n' || s.semantic_markdown
+                END,
+                '' ORDER BY s.pos
+            )
+            FROM (
+                SELECT
+                    source_domain,
+                    semantic_markdown,
+                    ROW_NUMBER() OVER (ORDER BY source_rank, source_domain) AS pos
+                FROM public.ontology_entity_sources
+                WHERE qualified_name = e.qualified_name AND semantic_markdown IS NOT NULL
+            ) s
+        ) AS semantic_markdown,
+        (
+            SELECT agentic_markdown
+            FROM public.ontology_entity_sources
+            WHERE qualified_name = e.qualified_name AND agentic_markdown IS NOT NULL
+            ORDER BY source_rank DESC, source_domain DESC
+            LIMIT 1
+        ) AS agentic_markdown,
+        (
+            SELECT JSONB_AGG(a.axiom ORDER BY a.pos)
+            FROM (
+                SELECT x.axiom, MIN(s.source_rank::BIGINT * 1000000 + x.ord) AS pos
+                FROM public.ontology_entity_sources s
+                CROSS JOIN LATERAL JSONB_ARRAY_ELEMENTS(s.axioms_json) WITH ORDINALITY AS x(axiom, ord)
+                WHERE s.qualified_name = e.qualified_name
+                GROUP BY x.axiom
+            ) a
+        ) AS axioms_json
+    WHERE e.qualified_name LIKE 'ECOSYSTEM.%'
+) src ON TRUE;
+
+COMMENT ON VIEW public.ontology_entities_merged IS 'ontology_entities with ECOSYSTEM docs/axioms merged across contributing domains.';
@@ -0,0 +1,124 @@
+"""
+Single-pass markdown parser for ontology docs (SEMANTIC / AGENTIC).
+
+Extracts, in one linear scan over the lines of a document:
+- GitHub callouts:          > [!TYPE] Message
+- Numbered business rules:  ### 3.X. Rule Name (body runs until the next heading)
+- Dates:                    Created: YYYY-MM-DD / Last Updated: YYYY-MM-DD
+
+Used by sync_ontology_to_pg.py. Benchmark: scripts/bench_markdown_parser.py
+"""
+
+import io
+import re
+from datetime import datetime
+
+CALLOUT_RE = re.compile(r'> \[!([^\]\n]*)\]\s*(.*)')
+RULE_RE = re.compile(r'### \d+\.\d+\. (.*)')
+
+def _iter_lines(content):
+    if isinstance(content, str):
+        content = io.StringIO(content)
+    for line in content:
+        yield line.rstrip('\r\n')
+
+def _parse_date(line, marker):
+    try:
+        return datetime.strptime(line.split(marker)[1].strip(), '%Y-%m-%d')
+    except (IndexError, ValueError):
+        return None
+
+def iter_markdown_events(content):
+    """
+    Yield (kind, value) events from a markdown document.
+
+    content may be a string or any iterable of lines (e.g. an open file), so
+    large docs can be streamed. kind is one of:
+      - "callout": {"type", "description", "source": "callout"}
+      - "rule":    {"type": "BUSINESS_RULE", "title", "description", "source": "section"}
+      - "created" / "updated": datetime
+    Callouts and rules are emitted when they end, not when they start.
+    """
+    callout = None  # (type, [message parts])
+    rule = None     # (title, [body lines])
+
+    def close_callout():
+        type_str, parts = callout
+        return "callout", {
+            "type": type_str.strip(),
+            "description": " ".join(p for p in parts if p).strip(),
+            "source": "callout",
+        }
+
+    def close_rule():
+        title, body = rule
+        return "rule", {
+            "type": "BUSINESS_RULE",
+            "title": title.strip(),
+            "description": "\n".join(body).strip(),
+            "source": "section",
+        }
+
+    for line in _iter_lines(content):
+        stripped = line.strip()
+        is_heading = line.startswith('#')
+
+        # --- Callouts: header line, then continuation until blank line or heading ---
+        header = CALLOUT_RE.search(line) if '[!' in line else None
+        if callout is not None and (header or not stripped or is_heading):
+            yield close_callout()
+            callout = None
+        if header:
+            callout = (header.group(1), [header.group(2).strip()])
+        elif callout is not None:
+            callout[1].append(stripped.lstrip('>').strip())
+
+        # --- Business rules: body runs until the next heading of any level ---
+        if is_heading:
+            if rule is not None:
+                yield close_rule()
+                rule = None
+            match = RULE_RE.match(line)
+            if match:
+                rule = (match.group(1), [])
+        elif rule is not None:
+            rule[1].append(line)
+
+        # --- Dates (last occurrence wins, like the header of most docs) ---
+        if 'Created:' in line:
+            created_at = _parse_date(line, 'Created:')
+            if created_at:
+                yield "created", created_at
+        if 'Last Updated:' in line:
+            updated_at = _parse_date(line, 'Last Updated:')
+            if updated_at:
+                yield "updated", updated_at
+
+    if callout is not None:
+        yield close_callout()
+    if rule is not None:
+        yield close_rule()
+
+def parse_markdown(content):
+    """
+    Parse a document in one pass.
+
+    Returns (axioms, created_at, updated_at). axioms lists callouts first,
+    then business rules; dates fall back to now() when absent.
+    """
+    callouts = []
+    rules = []
+    created_at = None
+    updated_at = None
+    if content:
+        for kind, value in iter_markdown_events(content):
+            if kind == "callout":
+                callouts.append(value)
+            elif kind == "rule":
+                rules.append(value)
+            elif kind == "created":
+                created_at = value
+            else:
+                updated_at = value
+    now = datetime.now()
+    return callouts + rules, created_at or now, updated_at or now
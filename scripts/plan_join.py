@@ -0,0 +1,62 @@
+"""
+Plan a cross-domain join from CROSS_DOMAIN_GLUE and print the Snowflake SQL.
+
+Usage:
+  python scripts/plan_join.py SAAS.BUDGETS FINTECH.CREDIT_SIMULATIONS
+  python scripts/plan_join.py SAAS.CLINICS FINTECH.CLINICS \\
+      --table SAAS.CLINICS=CAPIM_DATA.CAPIM_ANALYTICS.CLINICS --where "t0.clinic_id = 12345" --explain
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from ontology_graph import explain_cost, load_graph, plan_join
+
+def parse_tables(pairs):
+    tables = {}
+    for pair in pairs or []:
+        entity, sep, table = pair.partition('=')
+        if not sep or not entity or not table:
+            raise SystemExit(f"--table expects ENTITY=DB.SCHEMA.TABLE, got {pair!r}")
+        tables[entity.strip()] = table.strip()
+    return tables
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan a cross-domain join over the glue bridges")
+    parser.add_argument("source", help="Qualified source entity (e.g. SAAS.BUDGETS)")
+    parser.add_argument("target", help="Qualified target entity (e.g. FINTECH.CREDIT_SIMULATIONS)")
+    parser.add_argument("--table", action="append", metavar="ENTITY=TABLE",
+                        help="Physical table for an entity (default: the entity name); repeatable")
+    parser.add_argument("--where", action="append", help="Extra predicate on aliases t0..tN; repeatable")
+    parser.add_argument("--select", help="SELECT list (default: every column of every alias)")
+    parser.add_argument("--limit", type=int, help="LIMIT for the generated query")
+    parser.add_argument("--explain", action="store_true", help="Estimate the plan cost with Snowflake EXPLAIN")
+    args = parser.parse_args()
+
+    try:
+        plan = plan_join(load_graph(), args.source, args.target, tables=parse_tables(args.table),
+                         select=args.select, where=args.where, limit=args.limit)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    print(f"-- Path: {' -> '.join(plan['path'])} ({', '.join(plan['bridges'])}), bridge cost {plan['cost']}")
+    for warning in plan['warnings']:
+        print(f"-- WARNING: {warning}")
+    print(plan['sql'] + ";")
+
+    if args.explain:
+        cost = explain_cost(plan['sql'])
+        if cost is None:
+            print("\n[ERROR] EXPLAIN failed (see error above).")
+            sys.exit(1)
+        operations = ", ".join(f"{op} x{n}" for op, n in sorted(cost['operations'].items()))
+        print(f"\n-- EXPLAIN: partitions {cost['partitions_assigned']}/{cost['partitions_total']}, "
+              f"bytes {cost['bytes_assigned']}, operators: {operations}")
+        if cost['cartesian']:
+            print("-- [WARN] Plan contains a CartesianJoin.")
+
+if __name__ == "__main__":
+    main()
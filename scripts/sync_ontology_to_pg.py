@@ -55,7 +55,7 @@ def _get_vox_popular_pg_config():
 
 REGISTRY_PATH = "federation/DOMAIN_REGISTRY.yaml"
 
-import re
+from ontology_markdown import parse_markdown
 
 def extract_axioms(content):
     """
@@ -63,32 +63,8 @@ def extract_axioms(content):
     Looks for:
     - > [!TYPE] Message
     - ### 3.X. Rule Name
-    - ## Armadilhas / Guardrails
     """
-    axioms = []
-    if not content:
-        return axioms
-
-    # Regex for GitHub callouts: > [!DANGER] Message
-    callouts = re.findall(r'> \[!(.*?)\]\s*(.*?)(?=\n>|\n\n|\n#|$)', content, re.DOTALL)
-    for type_str, msg in callouts:
-        axioms.append({
-            "type": type_str.strip(),
-            "description": msg.strip().replace('\n> ', ' '),
-            "source": "callout"
-        })
-
-    # Regex for Business Rules: ### 3.X. Rule Name
-    rules = re.findall(r'### \d+\.\d+\. (.*?)\n(.*?)(?=\n###|\n##|\n#|$)', content, re.DOTALL)
-    for title, desc in rules:
-        axioms.append({
-            "type": "BUSINESS_RULE",
-            "title": title.strip(),
-            "description": desc.strip(),
-            "source": "section"
-        })
-
-    return axioms
+    return parse_markdown(content)[0]
 
 def get_file_content(path):
     if not path or not os.path.exists(path):
@@ -116,36 +92,797 @@ def get_sync_hash(content):
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
 def extract_dates(content):
-    """Simple extraction of Last Updated from markdown content."""
-    # Default to now if not found
-    updated_at = datetime.now()
-    created_at = datetime.now() # Fallback
-    
-    if not content:
-        return created_at, updated_at
-        
-    for line in content.split('\n'):
-        if 'Last Updated:' in line:
-            try:
-                date_str = line.split('Last Updated:')[1].strip()
-                updated_at = datetime.strptime(date_str, '%Y-%m-%d')
-            except:
-                pass
-        if 'Created:' in line:
-            try:
-                date_str = line.split('Created:')[1].strip()
-                created_at = datetime.strptime(date_str, '%Y-%m-%d')
-            except:
-                pass
-    
+    """Created / Last Updated dates from markdown content (now() when absent)."""
+    _, created_at, updated_at = parse_markdown(content)
     return created_at, updated_at
 
 import argparse
+import copy
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+DEFAULT_BATCH_SIZE = 500
+
+ENTITY_COLUMNS = """
+        qualified_name, domains, tier, semantic_markdown, agentic_markdown, axioms_json, 
+        status, metadata, sync_hash, created_at, updated_at, synced_at, source_rank
+"""
+
+# The stored row yields to an incoming one unless it comes from another domain
+# that ranks earlier in DOMAIN_REGISTRY (a NULL rank predates the column).
+KEEP_EXISTING = """(
+            (public.ontology_entities.metadata->>'source_domain') IS DISTINCT FROM (EXCLUDED.metadata->>'source_domain')
+            AND COALESCE(public.ontology_entities.source_rank, 2147483647) < EXCLUDED.source_rank
+        )"""
+
+# The owning (earliest-ranked) domain's metadata keys win
+MERGED_METADATA = f"""(CASE WHEN {KEEP_EXISTING}
+            THEN (EXCLUDED.metadata::jsonb) || (public.ontology_entities.metadata::jsonb)
+            ELSE (public.ontology_entities.metadata::jsonb) || (EXCLUDED.metadata::jsonb)
+        END)"""
+
+# Merge rules shared by the row upsert and the --bulk COPY merge: domains are
+# unioned, the best (lowest) tier wins and metadata accumulates. Docs, axioms,
+# status and metadata.source_domain come from the contributing domain that
+# ranks first in DOMAIN_REGISTRY (the canonical owner, e.g. SAAS for
+# ECOSYSTEM.CLINICS), so the base row does not depend on which domain's docs
+# changed last. Every domain's contribution to an ECOSYSTEM entity is kept in
+# ontology_entity_sources and merged on read by the ontology_entities_merged
+# view, so this update costs the same on every sync.
+ON_CONFLICT_SQL = f"""
+    ON CONFLICT (qualified_name) DO UPDATE SET
+        domains = ARRAY(SELECT DISTINCT UNNEST(public.ontology_entities.domains || EXCLUDED.domains)),
+        tier = LEAST(public.ontology_entities.tier, EXCLUDED.tier),
+        semantic_markdown = CASE WHEN {KEEP_EXISTING} THEN public.ontology_entities.semantic_markdown ELSE EXCLUDED.semantic_markdown END,
+        agentic_markdown = CASE WHEN {KEEP_EXISTING} THEN public.ontology_entities.agentic_markdown ELSE EXCLUDED.agentic_markdown END,
+        axioms_json = CASE WHEN {KEEP_EXISTING} THEN public.ontology_entities.axioms_json ELSE EXCLUDED.axioms_json END,
+        status = CASE WHEN {KEEP_EXISTING} THEN public.ontology_entities.status ELSE EXCLUDED.status END,
+        metadata = {MERGED_METADATA},
+        sync_hash = CASE WHEN {KEEP_EXISTING} THEN public.ontology_entities.sync_hash ELSE EXCLUDED.sync_hash END,
+        updated_at = CASE WHEN {KEEP_EXISTING} THEN public.ontology_entities.updated_at ELSE EXCLUDED.updated_at END,
+        source_rank = CASE WHEN {KEEP_EXISTING} THEN public.ontology_entities.source_rank ELSE EXCLUDED.source_rank END,
+        synced_at = EXCLUDED.synced_at
+    WHERE (NOT {KEEP_EXISTING} AND (
+            public.ontology_entities.sync_hash IS DISTINCT FROM EXCLUDED.sync_hash
+            OR public.ontology_entities.source_rank IS DISTINCT FROM EXCLUDED.source_rank))
+       OR NOT (public.ontology_entities.domains @> EXCLUDED.domains)
+       OR public.ontology_entities.tier > EXCLUDED.tier
+       OR {MERGED_METADATA} IS DISTINCT FROM public.ontology_entities.metadata::jsonb;
+"""
+
+SOURCE_COLUMNS = """
+        qualified_name, source_domain, source_rank, semantic_markdown, agentic_markdown,
+        axioms_json, sync_hash, synced_at
+"""
+
+# Per-domain ECOSYSTEM contributions: rewritten only when that domain's docs change.
+SOURCE_ON_CONFLICT_SQL = """
+    ON CONFLICT (qualified_name, source_domain) DO UPDATE SET
+        source_rank = EXCLUDED.source_rank,
+        semantic_markdown = EXCLUDED.semantic_markdown,
+        agentic_markdown = EXCLUDED.agentic_markdown,
+        axioms_json = EXCLUDED.axioms_json,
+        sync_hash = EXCLUDED.sync_hash,
+        synced_at = EXCLUDED.synced_at
+    WHERE public.ontology_entity_sources.sync_hash IS DISTINCT FROM EXCLUDED.sync_hash
+       OR public.ontology_entity_sources.source_rank IS DISTINCT FROM EXCLUDED.source_rank;
+"""
+
+# execute_values() formats the statement, so literal '%' must be doubled.
+UPSERT_SQL = (
+    f"INSERT INTO public.ontology_entities ({ENTITY_COLUMNS}) VALUES %s"
+    + ON_CONFLICT_SQL.replace('%', '%%')
+)
+
+SOURCE_UPSERT_SQL = (
+    f"INSERT INTO public.ontology_entity_sources ({SOURCE_COLUMNS}) VALUES %s"
+    + SOURCE_ON_CONFLICT_SQL.replace('%', '%%')
+)
+
+UPSERT_TEMPLATE = """(
+    %(qualified_name)s, %(domains)s, %(tier)s, %(semantic_markdown)s, 
+    %(agentic_markdown)s, %(axioms_json)s, %(status)s, %(metadata)s, %(sync_hash)s, 
+    %(created_at)s, %(updated_at)s, %(synced_at)s, %(source_rank)s
+)"""
+
+SOURCE_TEMPLATE = """(
+    %(qualified_name)s, %(source_domain)s, %(source_rank)s, %(semantic_markdown)s,
+    %(agentic_markdown)s, %(axioms_json)s, %(sync_hash)s, %(synced_at)s
+)"""
+
+def load_entity_docs(root_path, entity):
+    """Resolve and read an entity's semantic/agentic docs."""
+    sem_path = resolve_doc_path(root_path, entity.get('semantic_doc'))
+    age_path = resolve_doc_path(root_path, entity.get('agentic_doc'))
+    return sem_path, age_path, get_file_content(sem_path), get_file_content(age_path)
+
+def build_entity_row(domain_id, entity, sem_content, age_content, sync_hash=None):
+    """Prepare the row to upsert into ontology_entities from an entity's docs."""
+    qualified_name = entity['id']
+
+    # Extract axioms and timestamps: one pass per document
+    sem_axioms, sem_created, sem_updated = parse_markdown(sem_content)
+    age_axioms, age_created, age_updated = parse_markdown(age_content)
+    axioms = sem_axioms + age_axioms
+    if sem_content:
+        created_at, updated_at = sem_created, sem_updated
+    else:
+        created_at, updated_at = age_created, age_updated
+
+    # Calculate hash
+    if sync_hash is None:
+        sync_hash = get_sync_hash((sem_content or "") + (age_content or ""))
+
+    return {
+        "qualified_name": qualified_name,
+        "domains": entity['domains'],
+        "tier": entity['tier'],
+        "semantic_markdown": sem_content,
+        "agentic_markdown": age_content,
+        "axioms_json": psycopg2.extras.Json(axioms),
+        "status": entity.get('status', 'ACTIVE'),
+        "metadata": psycopg2.extras.Json({
+            "source_domain": domain_id,
+            "tier": entity['tier'],
+            "original_paths": {
+                "semantic": entity.get('semantic_doc'),
+                "agentic": entity.get('agentic_doc')
+            }
+        }),
+        "sync_hash": sync_hash,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "synced_at": datetime.now()
+    }
+
+MANIFEST_PATH = ".sync_manifest.json"
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Load the local sync manifest.
+
+    Layout:
+      files:    doc path -> {mtime_ns, size, md5} (null when the doc is missing)
+      entities: "<DOMAIN>:<qualified_name>" -> {fingerprint, paths, sync_hash}
+    """
+    empty = {"files": {}, "entities": {}}
+    if not os.path.exists(path):
+        return empty
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Ignoring unreadable manifest {path}: {e}")
+        return empty
+    manifest.setdefault("files", {})
+    manifest.setdefault("entities", {})
+    return manifest
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def fetch_remote_hashes(cursor):
+    """
+    Stored hashes, keyed by qualified_name for ontology_entities rows and by
+    "<DOMAIN>:<qualified_name>" (SyncManifest.key) for ECOSYSTEM contributions.
+    """
+    cursor.execute("""
+        SELECT qualified_name, sync_hash FROM public.ontology_entities
+        UNION ALL
+        SELECT source_domain || ':' || qualified_name, sync_hash FROM public.ontology_entity_sources;
+    """)
+    return dict(cursor.fetchall())
+
+def entity_fingerprint(entity):
+    """Hash of the index entry itself, so tier/domains/status edits are not missed."""
+    return get_sync_hash(json.dumps(entity, sort_keys=True, default=str))
+
+class SyncManifest:
+    """
+    Decides which entities can be skipped and records what was synced.
+
+    An entity is skipped when its index entry and doc files are unchanged
+    since the last sync AND the database still holds what we sent. For
+    ECOSYSTEM entities that is the domain's own row in ontology_entity_sources.
+
+    Updates are staged and only become visible through commit(), which the
+    caller invokes once the database transaction has been committed.
+    """
+
+    def __init__(self, manifest, remote_hashes):
+        self.files = manifest["files"]
+        self.entities = manifest["entities"]
+        self.remote_hashes = remote_hashes
+        self.skipped = 0
+        self.rollback()
+
+    @staticmethod
+    def key(domain_id, qualified_name):
+        return f"{domain_id}:{qualified_name}"
+
+    def _is_current(self, key, qualified_name, sync_hash):
+        if qualified_name.startswith('ECOSYSTEM.'):
+            return self.remote_hashes.get(key) == sync_hash
+        return self.remote_hashes.get(qualified_name) == sync_hash
+
+    def _file_unchanged(self, path):
+        if path not in self.files:
+            return False
+        recorded = self.files[path]
+        try:
+            st = os.stat(path)
+        except OSError:
+            return recorded is None
+        return (
+            recorded is not None
+            and recorded["mtime_ns"] == st.st_mtime_ns
+            and recorded["size"] == st.st_size
+        )
+
+    def skip_unread(self, key, qualified_name, fingerprint, paths):
+        """Stat-only check: True when nothing needs to be read for this entity."""
+        prev = self.entities.get(key)
+        if not prev or prev["fingerprint"] != fingerprint or prev["paths"] != paths:
+            return False
+        if not all(self._file_unchanged(p) for p in paths if p):
+            return False
+        if not self._is_current(key, qualified_name, prev["sync_hash"]):
+            return False
+        self.pending_entities[key] = prev
+        for p in paths:
+            if p:
+                self.pending_files[p] = self.files[p]
+        self.skipped += 1
+        return True
+
+    def skippable_hash(self, key, qualified_name, fingerprint):
+        """sync_hash that lets this entity skip parsing once its docs are hashed, or None."""
+        prev = self.entities.get(key)
+        if not prev or prev["fingerprint"] != fingerprint:
+            return None
+        if not self._is_current(key, qualified_name, prev["sync_hash"]):
+            return None
+        return prev["sync_hash"]
+
+    def record(self, key, fingerprint, paths, md5s, sync_hash):
+        for path, md5 in zip(paths, md5s):
+            if not path:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                self.pending_files[path] = None
+                continue
+            self.pending_files[path] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "md5": md5,
+            }
+        self.pending_entities[key] = {
+            "fingerprint": fingerprint,
+            "paths": paths,
+            "sync_hash": sync_hash,
+        }
+
+    def mark_written(self, key, qualified_name, sync_hash):
+        self.pending_remote[qualified_name] = sync_hash
+        self.pending_remote[key] = sync_hash
+
+    def commit(self, prune=False):
+        """
+        Adopt the staged state. prune=True (full pass over the registry) drops
+        entries for entities and docs that are no longer indexed.
+        """
+        if prune:
+            self.files = self.pending_files
+            self.entities = self.pending_entities
+        else:
+            self.files.update(self.pending_files)
+            self.entities.update(self.pending_entities)
+        self.remote_hashes.update(self.pending_remote)
+        self.rollback()
+
+    def rollback(self):
+        self.pending_files = {}
+        self.pending_entities = {}
+        self.pending_remote = {}
+
+    def as_dict(self):
+        return {"files": self.files, "entities": self.entities}
+
+def prepare_entity(task):
+    """
+    Read, hash and (unless skippable) parse one entity.
+
+    Runs inside the --workers pool, so it only takes and returns picklable data.
+    task = (domain_id, root_path, entity, skip_hash); when the docs hash to
+    skip_hash the entity is unchanged and no row is built.
+    """
+    domain_id, root_path, entity, skip_hash = task
+    _, _, sem_content, age_content = load_entity_docs(root_path, entity)
+    sync_hash = get_sync_hash((sem_content or "") + (age_content or ""))
+    row = None
+    if sync_hash != skip_hash:
+        row = build_entity_row(domain_id, entity, sem_content, age_content, sync_hash)
+    return {
+        "sync_hash": sync_hash,
+        "md5s": [get_sync_hash(sem_content), get_sync_hash(age_content)],
+        "row": row,
+    }
+
+def iter_prepared(tasks, workers=1, pool='thread'):
+    """Yield prepare_entity() results in task order, fanning out when workers > 1."""
+    if workers <= 1 or len(tasks) <= 1:
+        yield from map(prepare_entity, tasks)
+        return
+    executor_cls = ProcessPoolExecutor if pool == 'process' else ThreadPoolExecutor
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with executor_cls(max_workers=workers) as executor:
+        yield from executor.map(prepare_entity, tasks, chunksize=chunksize)
+
+def load_registry():
+    with open(REGISTRY_PATH, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+def domain_index_path(domain):
+    # Prefer ontology_index if present (CLIENT_VOICE), fallback to entity_index
+    index_rel_path = domain.get('ontology_index') or domain.get('entity_index')
+    if not index_rel_path:
+        return None
+    return os.path.join(domain['root_path'], index_rel_path)
+
+def load_domain_entities(domain, verbose=True):
+    """Entities listed in a domain's index, or None when the index is unavailable."""
+    domain_id = domain['id']
+    index_path = domain_index_path(domain)
+    if not index_path:
+        if verbose:
+            print(f"[WARN] Skipping {domain_id}: neither ontology_index nor entity_index present in registry")
+        return None
+
+    if not os.path.exists(index_path):
+        if verbose:
+            print(f"[WARN] Skipping {domain_id}: Index not found at {index_path}")
+        return None
+
+    if verbose:
+        print(f"[DOMAIN] Processing domain: {domain_id}")
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = yaml.safe_load(f)
+    return index['entities']
+
+def iter_registry_entities(registry):
+    """Yield (domain_id, root_path, entity) for every entity of every registered domain."""
+    for domain in registry['domains']:
+        entities = load_domain_entities(domain)
+        if entities is None:
+            continue
+        for entity in entities:
+            yield domain['id'], domain['root_path'], entity
+
+def source_rank(row, domain_ranks):
+    """Registry position of the domain a row comes from (unknown domains rank last)."""
+    return domain_ranks.get(row['metadata'].adapted['source_domain'], len(domain_ranks))
+
+def source_row(row, domain_ranks):
+    """ontology_entity_sources row for an ECOSYSTEM entity's row, or None."""
+    if not row['qualified_name'].startswith('ECOSYSTEM.'):
+        return None
+    source_domain = row['metadata'].adapted['source_domain']
+    return {
+        "qualified_name": row['qualified_name'],
+        "source_domain": source_domain,
+        "source_rank": source_rank(row, domain_ranks),
+        "semantic_markdown": row['semantic_markdown'],
+        "agentic_markdown": row['agentic_markdown'],
+        "axioms_json": row['axioms_json'],
+        "sync_hash": row['sync_hash'],
+        "synced_at": row['synced_at'],
+    }
+
+def write_batch(cursor, rows, domain_ranks):
+    """
+    Upsert a batch of rows in a single round trip (two when the batch holds
+    ECOSYSTEM entities, whose per-domain contributions go to
+    ontology_entity_sources).
+
+    A batch never holds the same qualified_name twice (Postgres refuses to
+    touch a row twice in one ON CONFLICT statement), see BatchWriter.
+    Returns the number of statements sent.
+    """
+    if not rows:
+        return 0
+    ranked = [dict(row, source_rank=source_rank(row, domain_ranks)) for row in rows]
+    psycopg2.extras.execute_values(
+        cursor, UPSERT_SQL, ranked, template=UPSERT_TEMPLATE, page_size=len(ranked)
+    )
+    sources = [r for r in (source_row(row, domain_ranks) for row in rows) if r]
+    if sources:
+        psycopg2.extras.execute_values(
+            cursor, SOURCE_UPSERT_SQL, sources, template=SOURCE_TEMPLATE, page_size=len(sources)
+        )
+        return 2
+    return 1
+
+class BatchWriter:
+    """
+    Buffers prepared rows and flushes them with write_batch().
+
+    Rows are flushed in arrival order. A batch is cut early when an entity
+    already buffered shows up again (ECOSYSTEM entities are declared by several
+    domains), since one statement cannot touch the same row twice.
+
+    domain_ranks maps domain id -> registry position; it picks which
+    contribution the ontology_entities row keeps and orders ECOSYSTEM
+    contributions in the merged view.
+    """
+
+    def __init__(self, cursor, batch_size=DEFAULT_BATCH_SIZE, domain_ranks=None):
+        self.cursor = cursor
+        self.batch_size = max(1, batch_size)
+        self.domain_ranks = domain_ranks or {}
+        self.rows = []
+        self.keys = set()
+        self.round_trips = 0
+        self.written = 0
+
+    def add(self, row):
+        if row['qualified_name'] in self.keys:
+            self.flush()
+        self.rows.append(row)
+        self.keys.add(row['qualified_name'])
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        self.round_trips += write_batch(self.cursor, self.rows, self.domain_ranks)
+        self.written += len(self.rows)
+        self.rows = []
+        self.keys = set()
+
+def registry_domain_ranks(registry):
+    return {domain['id']: rank for rank, domain in enumerate(registry['domains'])}
+
+STAGE_TABLE = "ontology_entities_stage"
+
+# Collapses the staged rows to one row per qualified_name, applying the same
+# merge rules as ON_CONFLICT_SQL (the earliest-ranked domain's row wins), then
+# merges that into the live table.
+BULK_MERGE_SQL = f"""
+    WITH first_rows AS (
+        SELECT DISTINCT ON (qualified_name) qualified_name, created_at
+        FROM {STAGE_TABLE}
+        ORDER BY qualified_name, seq
+    ),
+    owner_rows AS (
+        SELECT DISTINCT ON (qualified_name) *
+        FROM {STAGE_TABLE}
+        ORDER BY qualified_name, source_rank, seq DESC
+    ),
+    tiers AS (
+        SELECT qualified_name, MIN(tier) AS tier
+        FROM {STAGE_TABLE}
+        GROUP BY qualified_name
+    ),
+    domain_sets AS (
+        SELECT s.qualified_name, ARRAY_AGG(DISTINCT d.domain) AS domains
+        FROM {STAGE_TABLE} s
+        CROSS JOIN LATERAL UNNEST(s.domains) AS d(domain)
+        GROUP BY s.qualified_name
+    ),
+    metadata_merged AS (
+        -- Later keys win, like jsonb || jsonb: the earliest-ranked domain is aggregated last.
+        SELECT s.qualified_name, JSONB_OBJECT_AGG(m.key, m.value ORDER BY s.source_rank DESC, s.seq) AS metadata
+        FROM {STAGE_TABLE} s
+        CROSS JOIN LATERAL JSONB_EACH(s.metadata) AS m
+        GROUP BY s.qualified_name
+    )
+    INSERT INTO public.ontology_entities ({ENTITY_COLUMNS})
+    SELECT
+        l.qualified_name,
+        COALESCE(d.domains, '{{}}'::TEXT[]),
+        t.tier,
+        l.semantic_markdown,
+        l.agentic_markdown,
+        l.axioms_json,
+        l.status,
+        COALESCE(m.metadata, '{{}}'::JSONB),
+        l.sync_hash,
+        f.created_at,
+        l.updated_at,
+        l.synced_at,
+        l.source_rank
+    FROM owner_rows l
+    JOIN first_rows f USING (qualified_name)
+    JOIN tiers t USING (qualified_name)
+    LEFT JOIN domain_sets d USING (qualified_name)
+    LEFT JOIN metadata_merged m USING (qualified_name)
+    {ON_CONFLICT_SQL}
+"""
+
+BULK_SOURCES_SQL = f"""
+    INSERT INTO public.ontology_entity_sources ({SOURCE_COLUMNS})
+    SELECT DISTINCT ON (qualified_name, metadata->>'source_domain')
+        qualified_name, metadata->>'source_domain', source_rank, semantic_markdown,
+        agentic_markdown, axioms_json, sync_hash, synced_at
+    FROM {STAGE_TABLE}
+    WHERE qualified_name LIKE 'ECOSYSTEM.%'
+    ORDER BY qualified_name, metadata->>'source_domain', seq DESC
+    {SOURCE_ON_CONFLICT_SQL}
+"""
+
+def _csv_field(value):
+    """COPY CSV field: unquoted empty is NULL, anything else is quoted."""
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+def _pg_text_array(values):
+    items = ('"' + v.replace('\\', '\\\\').replace('"', '\\"') + '"' for v in values)
+    return '{' + ','.join(items) + '}'
+
+class CopyWriter:
+    """
+    --bulk writer: spools every prepared row as CSV, then on flush() streams
+    them with one COPY into a temp staging table and merges the staging table
+    into ontology_entities with a single set-based statement (BULK_MERGE_SQL),
+    plus one for the ECOSYSTEM contributions (BULK_SOURCES_SQL).
+
+    Same add()/flush() interface as BatchWriter.
+    """
+
+    def __init__(self, cursor, domain_ranks=None, spool_bytes=64 * 1024 * 1024):
+        self.cursor = cursor
+        self.domain_ranks = domain_ranks or {}
+        self.buffer = tempfile.SpooledTemporaryFile(
+            max_size=spool_bytes, mode='w+', encoding='utf-8', newline=''
+        )
+        self.staged = 0
+        self.round_trips = 0
+        self.written = 0
+
+    def add(self, row):
+        fields = [
+            self.staged,
+            row['qualified_name'],
+            _pg_text_array(row['domains']),
+            row['tier'],
+            row['semantic_markdown'],
+            row['agentic_markdown'],
+            json.dumps(row['axioms_json'].adapted),
+            row['status'],
+            json.dumps(row['metadata'].adapted),
+            row['sync_hash'],
+            row['created_at'].isoformat(),
+            row['updated_at'].isoformat(),
+            row['synced_at'].isoformat(),
+            self.domain_ranks.get(row['metadata'].adapted['source_domain'], len(self.domain_ranks)),
+        ]
+        self.buffer.write(','.join(_csv_field(v) for v in fields) + '\n')
+        self.staged += 1
+
+    def flush(self):
+        if not self.staged:
+            return
+        self.cursor.execute(f"""
+            CREATE TEMP TABLE {STAGE_TABLE} (
+                seq INTEGER, qualified_name TEXT, domains TEXT[], tier INTEGER,
+                semantic_markdown TEXT, agentic_markdown TEXT, axioms_json JSONB,
+                status TEXT, metadata JSONB, sync_hash TEXT,
+                created_at TIMESTAMPTZ, updated_at TIMESTAMPTZ, synced_at TIMESTAMPTZ,
+                source_rank INTEGER
+            ) ON COMMIT DROP;
+        """)
+        self.buffer.seek(0)
+        self.cursor.copy_expert(f"COPY {STAGE_TABLE} FROM STDIN WITH (FORMAT csv)", self.buffer)
+        self.cursor.execute(BULK_MERGE_SQL)
+        self.cursor.execute(BULK_SOURCES_SQL)
+        self.round_trips += 4
+        self.written += self.staged
+        self.staged = 0
+        self.buffer.close()
+
+def sync_entities(entries, writer, tracker, workers=1, pool='thread', dry_run=False):
+    """
+    Sync (domain_id, root_path, entity) entries through the manifest, the
+    worker pool and the batch writer. Flushes but does not commit.
+    """
+    # Stage 1 (main thread): stat-only manifest check.
+    tasks = []
+    task_keys = []
+    for domain_id, root_path, entity in entries:
+        qualified_name = entity['id']
+        key = SyncManifest.key(domain_id, qualified_name)
+        fingerprint = entity_fingerprint(entity)
+        paths = [
+            resolve_doc_path(root_path, entity.get('semantic_doc')),
+            resolve_doc_path(root_path, entity.get('agentic_doc')),
+        ]
+        if tracker and tracker.skip_unread(key, qualified_name, fingerprint, paths):
+            continue
+        skip_hash = tracker.skippable_hash(key, qualified_name, fingerprint) if tracker else None
+        tasks.append((domain_id, root_path, entity, skip_hash))
+        task_keys.append((key, fingerprint, paths))
+
+    # Stage 2 (pool): read + hash + parse. Stage 3 (main thread): single DB writer,
+    # consuming results in registry order so ECOSYSTEM merges stay deterministic.
+    print(f"[SYNC] Preparing {len(tasks)} entities with {workers} worker(s)...")
+    for task, (key, fingerprint, paths), result in zip(
+        tasks, task_keys, iter_prepared(tasks, workers, pool)
+    ):
+        qualified_name = task[2]['id']
+        if tracker:
+            tracker.record(key, fingerprint, paths, result["md5s"], result["sync_hash"])
+        data = result["row"]
+        if data is None:
+            tracker.skipped += 1
+            continue
+
+        print(f"   [ENTITY] Syncing: {qualified_name}")
+
+        if dry_run:
+            print(f"      [OK] [DRY RUN] Prepared data for {qualified_name}")
+            print(f"      - Axioms: {len(data['axioms_json'].adapted)}")
+            print(f"      - Hash: {data['sync_hash']}")
+            continue
+
+        writer.add(data)
+        tracker.mark_written(key, qualified_name, data['sync_hash'])
+
+    if writer:
+        writer.flush()
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+class WatchPlan:
+    """
+    What --watch polls: the registry, every domain index and every entity doc,
+    plus which entities each of those paths feeds.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.domains = registry['domains']
+        self.index_paths = {}  # index path -> domain_id
+        self.entities = {}     # domain_id -> [entity]
+        for domain in self.domains:
+            self.reload_domain(domain['id'])
+
+    def reload_domain(self, domain_id):
+        domain = next(d for d in self.domains if d['id'] == domain_id)
+        index_path = domain_index_path(domain)
+        if index_path:
+            self.index_paths[index_path] = domain_id
+        self.entities[domain_id] = load_domain_entities(domain, verbose=False) or []
+
+    def with_reloaded(self, domain_ids):
+        """Copy of the plan with `domain_ids` re-read; self is untouched if a reload raises."""
+        plan = copy.copy(self)
+        plan.index_paths = dict(self.index_paths)
+        plan.entities = dict(self.entities)
+        for domain_id in domain_ids:
+            plan.reload_domain(domain_id)
+        return plan
+
+    def entries(self):
+        for domain in self.domains:
+            for entity in self.entities[domain['id']]:
+                yield domain['id'], domain['root_path'], entity
+
+    def doc_owners(self):
+        owners = {}
+        for domain_id, root_path, entity in self.entries():
+            for doc in (entity.get('semantic_doc'), entity.get('agentic_doc')):
+                path = resolve_doc_path(root_path, doc)
+                if path:
+                    owners.setdefault(path, set()).add(SyncManifest.key(domain_id, entity['id']))
+        return owners
+
+    def snapshot(self):
+        paths = [REGISTRY_PATH, *self.index_paths, *self.doc_owners()]
+        return {p: file_signature(p) for p in paths}
+
+def watch(conn, tracker, args):
+    """
+    Poll the registry, domain indexes and docs; after changes settle for
+    --debounce seconds, re-sync only the touched entities over the same
+    connection.
+    """
+    plan = WatchPlan(load_registry())
+    snapshot = plan.snapshot()
+    pending = set()
+    last_change = 0.0
+    # Set when the registry/an index failed to load: wait for the next edit before retrying
+    blocked = False
+    print(f"[WATCH] Watching {len(snapshot)} paths (poll {args.interval}s, debounce {args.debounce}s). Ctrl+C to stop.")
+
+    while True:
+        time.sleep(args.interval)
+        current = plan.snapshot()
+        changed = {p for p in current.keys() | snapshot.keys() if current.get(p) != snapshot.get(p)}
+        snapshot = current
+        if changed:
+            pending |= changed
+            last_change = time.monotonic()
+            blocked = False
+            continue
+        if blocked or not pending or time.monotonic() - last_change < args.debounce:
+            continue
+
+        print(f"[WATCH] {len(pending)} path(s) changed")
+        try:
+            # Half-saved or invalid YAML must not kill the watcher: build the new
+            # plan aside and only switch to it once every file loaded.
+            if REGISTRY_PATH in pending:
+                new_plan = WatchPlan(load_registry())
+                entries = list(new_plan.entries())
+            else:
+                touched_domains = {plan.index_paths[p] for p in pending if p in plan.index_paths}
+                new_plan = plan.with_reloaded(touched_domains)
+                owners = new_plan.doc_owners()
+                touched_keys = set().union(*(owners.get(p, set()) for p in pending))
+                entries = [
+                    e for e in new_plan.entries()
+                    if e[0] in touched_domains or SyncManifest.key(e[0], e[2]['id']) in touched_keys
+                ]
+            new_snapshot = new_plan.snapshot()
+        except Exception as e:
+            print(f"[ERROR] Could not reload registry/indexes, keeping the previous plan until the next change: {e}")
+            blocked = True
+            continue
+        plan, snapshot = new_plan, new_snapshot
+        pending = set()
+
+        try:
+            if conn.closed:
+                conn = psycopg2.connect(**_get_vox_popular_pg_config())
+            # One cursor per cycle, closed with it (a long session would leak one per cycle)
+            with conn.cursor() as cur:
+                writer = BatchWriter(cur, args.batch_size, registry_domain_ranks(plan.registry))
+                sync_entities(entries, writer, tracker, args.workers, args.pool)
+            conn.commit()
+            tracker.commit()
+            save_manifest(tracker.as_dict())
+            print(f"[OK] Re-synced {writer.written} rows in {writer.round_trips} round trips")
+        except Exception as e:
+            print(f"[ERROR] Watch cycle failed, rolling back: {e}")
+            tracker.rollback()
+            if not conn.closed:
+                conn.rollback()
 
 def sync():
     parser = argparse.ArgumentParser(description='Sync Ontology to PostgreSQL')
     parser.add_argument('--dry-run', action='store_true', help='Simulate sync without DB connection')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows per upsert round trip (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--full', action='store_true',
+                        help=f'Ignore {MANIFEST_PATH} and resync every entity')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parallel workers for reading/parsing docs (default: 1, serial)')
+    parser.add_argument('--pool', choices=['thread', 'process'], default='thread',
+                        help='Worker pool type; process helps when parsing, not I/O, dominates')
+    parser.add_argument('--bulk', action='store_true',
+                        help='First load / disaster recovery: COPY every entity into staging and merge set-based '
+                             '(implies --full)')
+    parser.add_argument('--watch', action='store_true',
+                        help='After the initial sync, keep polling docs/indexes and re-sync touched entities')
+    parser.add_argument('--interval', type=float, default=1.0, help='Watch poll interval in seconds')
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help='Seconds without further changes before a watch re-sync')
     args = parser.parse_args()
+    if args.watch and args.dry_run:
+        parser.error('--watch needs a database connection; drop --dry-run')
 
     print(f"[SYNC] Starting Ontology Synchronization... {'(DRY RUN)' if args.dry_run else ''}")
     
@@ -153,133 +890,58 @@ def sync():
         print(f"[ERROR] Registry not found: {REGISTRY_PATH}")
         return
 
-    with open(REGISTRY_PATH, 'r', encoding='utf-8') as f:
-        registry = yaml.safe_load(f)
+    registry = load_registry()
 
     conn = None
-    cursor = None
+    writer = None
+    tracker = None
 
     if not args.dry_run:
         try:
             config = _get_vox_popular_pg_config()
             conn = psycopg2.connect(**config)
-            cursor = conn.cursor()
+            if args.bulk:
+                writer = CopyWriter(conn.cursor(), registry_domain_ranks(registry))
+            else:
+                writer = BatchWriter(conn.cursor(), args.batch_size, registry_domain_ranks(registry))
+            if args.full or args.bulk:
+                tracker = SyncManifest({"files": {}, "entities": {}}, {})
+            else:
+                tracker = SyncManifest(load_manifest(), fetch_remote_hashes(writer.cursor))
         except Exception as e:
             print(f"[ERROR] Database connection failed: {e}")
             return
     else:
         print("[INFO] Dry run mode: Skipping database connection.")
 
-    for domain in registry['domains']:
-        domain_id = domain['id']
-        root_path = domain['root_path']
-        # Prefer ontology_index if present (CLIENT_VOICE), fallback to entity_index
-        index_rel_path = domain.get('ontology_index') or domain.get('entity_index')
-        if not index_rel_path:
-            print(f"[WARN] Skipping {domain_id}: neither ontology_index nor entity_index present in registry")
-            continue
-        index_path = os.path.join(root_path, index_rel_path)
-
-        if not os.path.exists(index_path):
-            print(f"[WARN] Skipping {domain_id}: Index not found at {index_path}")
-            continue
-
-        print(f"[DOMAIN] Processing domain: {domain_id}")
-        with open(index_path, 'r', encoding='utf-8') as f:
-            index = yaml.safe_load(f)
-
-        for entity in index['entities']:
-            qualified_name = entity['id']
-            print(f"   [ENTITY] Syncing: {qualified_name}")
-            
-            sem_path = resolve_doc_path(root_path, entity.get('semantic_doc'))
-            age_path = resolve_doc_path(root_path, entity.get('agentic_doc'))
-            
-            sem_content = get_file_content(sem_path)
-            age_content = get_file_content(age_path)
-            
-            # Extract Axioms
-            axioms = extract_axioms(sem_content) + extract_axioms(age_content)
-            
-            # Extract timestamps
-            created_at, updated_at = extract_dates(sem_content if sem_content else age_content)
-            
-            # Calculate hash
-            combined_content = (sem_content or "") + (age_content or "")
-            sync_hash = get_sync_hash(combined_content)
-            
-            # Prepare data
-            data = {
-                "qualified_name": qualified_name,
-                "domains": entity['domains'],
-                "tier": entity['tier'],
-                "semantic_markdown": sem_content,
-                "agentic_markdown": age_content,
-                "axioms_json": psycopg2.extras.Json(axioms),
-                "status": entity.get('status', 'ACTIVE'),
-                "metadata": psycopg2.extras.Json({
-                    "source_domain": domain_id,
-                    "tier": entity['tier'],
-                    "original_paths": {
-                        "semantic": entity.get('semantic_doc'),
-                        "agentic": entity.get('agentic_doc')
-                    }
-                }),
-                "sync_hash": sync_hash,
-                "created_at": created_at,
-                "updated_at": updated_at,
-                "synced_at": datetime.now()
-            }
-
-            if args.dry_run:
-                print(f"      [OK] [DRY RUN] Prepared data for {qualified_name}")
-                print(f"      - Axioms: {len(axioms)}")
-                print(f"      - Hash: {sync_hash}")
-                continue
-
-            # Upsert with ECOSYSTEM merge logic
-            # If ECOSYSTEM entity exists, we append the content if it's different
-            try:
-                cursor.execute("""
-                    INSERT INTO public.ontology_entities (
-                        qualified_name, domains, tier, semantic_markdown, agentic_markdown, axioms_json, 
-                        status, metadata, sync_hash, created_at, updated_at, synced_at
-                    ) VALUES (
-                        %(qualified_name)s, %(domains)s, %(tier)s, %(semantic_markdown)s, 
-                        %(agentic_markdown)s, %(axioms_json)s, %(status)s, %(metadata)s, %(sync_hash)s, 
-                        %(created_at)s, %(updated_at)s, %(synced_at)s
-                    )
-                    ON CONFLICT (qualified_name) DO UPDATE SET
-                        domains = ARRAY(SELECT DISTINCT UNNEST(public.ontology_entities.domains || EXCLUDED.domains)),
-                        tier = LEAST(public.ontology_entities.tier, EXCLUDED.tier),
-                        semantic_markdown = CASE 
-                            WHEN public.ontology_entities.qualified_name LIKE 'ECOSYSTEM.%%' 
-                            AND public.ontology_entities.semantic_markdown NOT LIKE '%%' || EXCLUDED.semantic_markdown || '%%'
-                            THEN public.ontology_entities.semantic_markdown
-                              || '\n\n--- [Merged from '
-                              || COALESCE((EXCLUDED.metadata::jsonb)->>'source_domain', 'unknown')
-                              || '] ---\n\n'
-                              || EXCLUDED.semantic_markdown
-                            ELSE EXCLUDED.semantic_markdown 
-                        END,
-                        agentic_markdown = EXCLUDED.agentic_markdown,
-                        axioms_json = (public.ontology_entities.axioms_json::jsonb) || (EXCLUDED.axioms_json::jsonb),
-                        status = EXCLUDED.status,
-                        metadata = (public.ontology_entities.metadata::jsonb) || (EXCLUDED.metadata::jsonb),
-                        sync_hash = EXCLUDED.sync_hash,
-                        updated_at = EXCLUDED.updated_at,
-                        synced_at = EXCLUDED.synced_at
-                    WHERE public.ontology_entities.sync_hash IS DISTINCT FROM EXCLUDED.sync_hash OR public.ontology_entities.qualified_name LIKE 'ECOSYSTEM.%%';
-                """, data)
-            except Exception as e:
-                print(f"      [ERROR] Error syncing {qualified_name}: {e}")
-                conn.rollback()
+    try:
+        sync_entities(
+            iter_registry_entities(registry), writer, tracker,
+            args.workers, args.pool, args.dry_run,
+        )
+    except Exception as e:
+        # Single transaction: a failed batch discards the whole sync so the
+        # table is never left half-merged.
+        print(f"[ERROR] Synchronization aborted, rolling back: {e}")
+        if conn:
+            conn.rollback()
+            conn.close()
+        return
 
     if not args.dry_run and conn:
         conn.commit()
-        cursor.close()
+        writer.cursor.close()
+        # Only now is it safe to remember what was synced.
+        tracker.commit(prune=True)
+        save_manifest(tracker.as_dict())
+        print(f"[SYNC] Unchanged entities skipped: {tracker.skipped}")
+        print(f"[OK] Synchronization complete! ({writer.written} rows in {writer.round_trips} round trips)")
+        if args.watch:
+            try:
+                watch(conn, tracker, args)
+            except KeyboardInterrupt:
+                print("\n[WATCH] Stopped.")
         conn.close()
-        print("[OK] Synchronization complete!")
     elif args.dry_run:
         print("[OK] Dry run complete!")
 
@@ -0,0 +1,22 @@
+"""
+Compiled, indexed ontology graph.
+
+    from ontology_graph import load_graph, route
+    graph = load_graph()                # parsed sources come from a hash-checked snapshot
+    graph.instances_under("ACTOR")      # ('SAAS.CLINICS', 'FINTECH.CLINICS', ...)
+    graph.bridges_for("SAAS.CLINICS")   # glue intersections touching the entity
+    route("Is clinic 12345 churning?")  # ranked CAPABILITY_MATRIX capabilities
+"""
+
+from .executor import RuleExecutor, plan_rule
+from .graph import OntologyGraph
+from .join_planner import explain_cost, plan_join
+from .loader import SOURCES, build_graph, load_graph, parse_sources, source_paths
+from .router import CapabilityRouter, load_router, route
+from .snapshot import load_sources, snapshot_path, sources_hash
+
+__all__ = [
+    "CapabilityRouter", "OntologyGraph", "RuleExecutor", "SOURCES", "build_graph", "explain_cost", "load_graph",
+    "load_router", "load_sources", "parse_sources", "plan_join", "plan_rule", "route", "snapshot_path",
+    "source_paths", "sources_hash",
+]
@@ -0,0 +1,268 @@
+"""
+Parallel executor for INFERENCE_RULES.yaml actions.
+
+A rule's actions form a DAG: an action depends on another when one of its
+params references that action's output_key ("{support_health}"); every other
+"{name}" placeholder is read from the caller's context. Independent actions
+are dispatched concurrently on a thread pool (capability handlers are
+blocking Snowflake/HTTP calls), so a rule costs its slowest dependency chain
+instead of the sum of its actions.
+
+Handlers are plain callables registered per capability name (QUERY actions)
+or per action type (e.g. RETRIEVE), called with the resolved params as
+keyword arguments. Within one RuleExecutor (a session), results are memoized
+per (handler, params): RULE-CROSS-001 and RULE-SAAS-001 share the ChurnRisk
+call for the same clinic, and concurrent identical calls share one future.
+
+    with RuleExecutor(handlers, graph=load_graph()) as executor:
+        run = executor.run("RULE-CROSS-001", {"resolved_clinic_id": 123})
+        run['outputs']['churn_data'], run['actions']  # per-action latency
+"""
+
+import json
+import re
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+# Action fields passed to non-QUERY handlers besides params
+EXTRA_FIELDS = ('source', 'query')
+
+
+def handler_key(action):
+    """Capability name for capability actions, else the action type."""
+    return action.get('capability') or action.get('type')
+
+
+def action_params(action):
+    params = dict(action.get('params') or {})
+    if not action.get('capability'):
+        for field in EXTRA_FIELDS:
+            if field in action:
+                params.setdefault(field, action[field])
+    return params
+
+
+def placeholders(value):
+    """Placeholder names referenced anywhere in a (nested) param value."""
+    if isinstance(value, str):
+        return set(PLACEHOLDER_RE.findall(value))
+    if isinstance(value, Mapping):
+        return set().union(*(placeholders(v) for v in value.values())) if value else set()
+    if isinstance(value, (list, tuple)):
+        return set().union(*(placeholders(v) for v in value)) if value else set()
+    return set()
+
+
+def resolve(value, scope):
+    """Substitute placeholders; a value that is exactly "{name}" keeps the raw object."""
+    if isinstance(value, str):
+        whole = PLACEHOLDER_RE.fullmatch(value)
+        if whole:
+            return scope[whole.group(1)]
+        return PLACEHOLDER_RE.sub(lambda m: str(scope[m.group(1)]), value)
+    if isinstance(value, Mapping):
+        return {k: resolve(v, scope) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [resolve(v, scope) for v in value]
+    return value
+
+
+def plan_rule(rule):
+    """
+    Dependency DAG of a rule's actions.
+
+    Returns a list of {'index', 'action', 'deps' (action indexes), 'inputs'
+    (context names needed), 'order' (position in a topological order)} in
+    YAML order. Raises ValueError on duplicate output_keys or dependency
+    cycles.
+    """
+    actions = list(rule.get('actions') or [])
+    producers = {}
+    for index, action in enumerate(actions):
+        key = action.get('output_key')
+        if key in producers:
+            raise ValueError(f"{rule.get('id')}: output_key {key!r} produced twice")
+        if key:
+            producers[key] = index
+
+    nodes = []
+    for index, action in enumerate(actions):
+        names = placeholders(action_params(action))
+        deps = {producers[n] for n in names if n in producers}
+        if index in deps:
+            raise ValueError(f"{rule.get('id')}: action {action.get('output_key')!r} depends on itself")
+        nodes.append({
+            'index': index,
+            'action': action,
+            'deps': frozenset(deps),
+            'inputs': frozenset(n for n in names if n not in producers),
+        })
+
+    # Kahn's algorithm: rejects cycles and gives every node its topological position
+    remaining = {n['index']: set(n['deps']) for n in nodes}
+    order = 0
+    while remaining:
+        ready = [i for i, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"{rule.get('id')}: dependency cycle between actions {sorted(remaining)}")
+        for i in ready:
+            del remaining[i]
+            nodes[i]['order'] = order
+            order += 1
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return nodes
+
+
+class RuleExecutor:
+    """
+    Runs inference rules against registered capability handlers.
+
+    handlers: {capability name or action type: callable(**params)}
+    graph:    optional OntologyGraph, used to look rules up by id and to
+              reject actions naming capabilities absent from CAPABILITY_MATRIX
+    """
+
+    def __init__(self, handlers, graph=None, max_workers=8):
+        self.handlers = dict(handlers)
+        self.graph = graph
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rule-action")
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def clear_cache(self):
+        with self._lock:
+            self._memo.clear()
+
+    def _rule(self, rule):
+        if isinstance(rule, str):
+            if self.graph is None or rule not in self.graph.rules:
+                raise KeyError(f"Unknown inference rule {rule}")
+            return self.graph.rules[rule]
+        return rule
+
+    def _check(self, rule, nodes, context):
+        problems = []
+        for node in nodes:
+            action = node['action']
+            key = handler_key(action)
+            if key not in self.handlers:
+                problems.append(f"no handler for {key}")
+            capability = action.get('capability')
+            if capability and self.graph is not None and self.graph.capability(capability) is None:
+                problems.append(f"capability {capability} is not in CAPABILITY_MATRIX")
+            missing = sorted(node['inputs'] - set(context))
+            if missing:
+                problems.append(f"{action.get('output_key') or key} needs {', '.join(missing)}")
+        if problems:
+            raise ValueError(f"{rule.get('id')}: " + "; ".join(problems))
+
+    def _call(self, key, params):
+        started = time.perf_counter()
+        value = self.handlers[key](**params)
+        return value, time.perf_counter() - started
+
+    def _dispatch(self, action, params):
+        """(future of (value, elapsed), cached?) with per-session memoization."""
+        key = handler_key(action)
+        memo_key = (key, json.dumps(params, sort_keys=True, default=str))
+        with self._lock:
+            future = self._memo.get(memo_key)
+            if future is not None:
+                return future, True
+            future = self._pool.submit(self._call, key, params)
+            self._memo[memo_key] = future
+        return future, False
+
+    def _forget_failure(self, future):
+        with self._lock:
+            for memo_key, memo_future in list(self._memo.items()):
+                if memo_future is future:
+                    del self._memo[memo_key]
+
+    def run(self, rule, context=None, parallel=True):
+        """
+        Execute every action of `rule` (dict or rule id).
+
+        Returns {'rule_id', 'outputs' {output_key: value}, 'actions' (one
+        record per action with status OK/ERROR/SKIPPED, elapsed, cached),
+        'elapsed'}. A failed action skips its dependents; independent
+        actions still run. parallel=False runs one action at a time (for
+        comparison and debugging).
+        """
+        rule = self._rule(rule)
+        context = dict(context or {})
+        nodes = plan_rule(rule)
+        self._check(rule, nodes, context)
+
+        outputs, records = {}, [None] * len(nodes)
+        done, failed = set(), set()
+        pending = {n['index'] for n in nodes}
+        running = {}
+        started = time.perf_counter()
+
+        def record(node, status, elapsed=None, cached=False, error=None):
+            action = node['action']
+            records[node['index']] = {
+                'output_key': action.get('output_key'),
+                'domain': action.get('domain'),
+                'handler': handler_key(action),
+                'status': status,
+                'elapsed': elapsed,
+                'cached': cached,
+                'error': error,
+            }
+
+        while pending or running:
+            # Topological order: a skip reaches every dependent in the same pass
+            for index in sorted(pending, key=lambda i: nodes[i]['order']):
+                if not parallel and running:
+                    break
+                node = nodes[index]
+                if node['deps'] & failed:
+                    record(node, 'SKIPPED', error="dependency failed")
+                    failed.add(index)
+                    pending.discard(index)
+                elif node['deps'] <= done:
+                    scope = {**context, **outputs}
+                    future, cached = self._dispatch(node['action'], resolve(action_params(node['action']), scope))
+                    running[future] = running.get(future, []) + [(node, cached)]
+                    pending.discard(index)
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                for node, cached in running.pop(future):
+                    try:
+                        value, elapsed = future.result()
+                    except Exception as e:
+                        self._forget_failure(future)
+                        record(node, 'ERROR', error=f"{type(e).__name__}: {e}")
+                        failed.add(node['index'])
+                        continue
+                    record(node, 'OK', elapsed=0.0 if cached else elapsed, cached=cached)
+                    if node['action'].get('output_key'):
+                        outputs[node['action']['output_key']] = value
+                    done.add(node['index'])
+
+        missing = [n['index'] for n in nodes if records[n['index']] is None]
+        assert not missing, f"{rule.get('id')}: actions {missing} were never recorded"
+        return {
+            'rule_id': rule.get('id'),
+            'outputs': outputs,
+            'actions': records,
+            'elapsed': time.perf_counter() - started,
+        }
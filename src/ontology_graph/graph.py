@@ -0,0 +1,255 @@
+"""
+Immutable, indexed view of the ontology and federation YAML files.
+
+OntologyGraph is built once (see loader.build_graph) and answers lookups
+from precomputed dicts instead of walking the YAML lists:
+
+  - class -> ancestors / descendants closure, instances in the subtree
+  - entity (e.g. SAAS.CLINICS) -> glue bridges touching it
+  - domain -> capabilities, capability name -> capability
+  - physical table (DB.SCHEMA.TABLE) -> axioms whose validation_query reads it
+  - capability -> inference rules that call it
+
+Lookups are O(1) dict hits returning tuples/frozensets (O(degree) to iterate).
+Records are read-only mappings; nothing in the graph can be mutated.
+"""
+
+from types import MappingProxyType
+
+from utils.sql_tables import table_refs
+
+EMPTY = ()
+
+
+def freeze(value):
+    """Deep read-only copy of parsed YAML (dict -> mappingproxy, list -> tuple)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def axiom_tables(sql):
+    """
+    Fully qualified DB.SCHEMA.TABLE names read by a validation_query (see
+    utils.sql_tables; unqualified names are left out of the index).
+    """
+    return table_refs(sql)[0]
+
+
+def _group(pairs):
+    """{key: tuple(values)} preserving first-seen order."""
+    grouped = {}
+    for key, value in pairs:
+        grouped.setdefault(key, []).append(value)
+    return MappingProxyType({k: tuple(v) for k, v in grouped.items()})
+
+
+class OntologyGraph:
+    """
+    Compiled ontology. Build with build_graph()/load_graph(), never by hand.
+
+    Raw records are available as `classes`, `bridges`, `domains`,
+    `capabilities_by_name`, `axioms`, `rules` (all read-only).
+    """
+
+    __slots__ = (
+        'classes', 'bridges', 'domains', 'capabilities_by_name', 'axioms', 'rules', 'routing',
+        '_ancestors', '_ancestor_sets', '_descendants', '_instances_under', '_class_of',
+        '_bridges_by_entity', '_neighbors', '_capabilities_by_domain', '_domain_of_capability',
+        '_axioms_by_table', '_axioms_by_domain', '_rules_by_capability', '_frozen',
+    )
+
+    def __init__(self, taxonomy, glue, capability_matrix, inference_rules, axioms):
+        self._frozen = False
+        self._index_taxonomy((taxonomy or {}).get('classes') or [])
+        self._index_glue((glue or {}).get('intersections') or [])
+        self._index_capabilities(capability_matrix or {})
+        self._index_axioms((axioms or {}).get('axioms') or [])
+        self._index_rules((inference_rules or {}).get('rules') or [])
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError("OntologyGraph is immutable")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError("OntologyGraph is immutable")
+
+    # --- Index construction ------------------------------------------------
+
+    def _index_taxonomy(self, classes):
+        by_name = {}
+        for cls in classes:
+            name = cls.get('name')
+            if not name:
+                raise ValueError(f"TAXONOMY class without name: {cls}")
+            if name in by_name:
+                raise ValueError(f"Duplicate TAXONOMY class {name}")
+            by_name[name] = cls
+        for name, cls in by_name.items():
+            parent = cls.get('parent')
+            if parent is not None and parent not in by_name:
+                raise ValueError(f"TAXONOMY class {name} has unknown parent {parent}")
+
+        # Ancestor closure, nearest first; cycles are rejected
+        ancestors = {}
+        for name in by_name:
+            chain, seen = [], {name}
+            parent = by_name[name].get('parent')
+            while parent is not None:
+                if parent in seen:
+                    raise ValueError(f"TAXONOMY cycle through {parent}")
+                seen.add(parent)
+                chain.append(parent)
+                parent = by_name[parent].get('parent')
+            ancestors[name] = tuple(chain)
+
+        descendants = {name: set() for name in by_name}
+        for name, chain in ancestors.items():
+            for ancestor in chain:
+                descendants[ancestor].add(name)
+
+        class_of, own_instances = {}, {}
+        for name, cls in by_name.items():
+            own_instances[name] = tuple(cls.get('instances') or EMPTY)
+            for instance in own_instances[name]:
+                if instance in class_of:
+                    raise ValueError(f"Instance {instance} listed under {class_of[instance]} and {name}")
+                class_of[instance] = name
+
+        # Instances of a class and its whole subtree, in TAXONOMY order
+        order = {name: i for i, name in enumerate(by_name)}
+        instances_under = {}
+        for name in by_name:
+            subtree = sorted(descendants[name] | {name}, key=order.__getitem__)
+            instances_under[name] = tuple(i for member in subtree for i in own_instances[member])
+
+        self.classes = freeze(by_name)
+        self._ancestors = MappingProxyType(ancestors)
+        self._ancestor_sets = MappingProxyType({n: frozenset(a) for n, a in ancestors.items()})
+        self._descendants = MappingProxyType({n: frozenset(d) for n, d in descendants.items()})
+        self._instances_under = MappingProxyType(instances_under)
+        self._class_of = MappingProxyType(class_of)
+
+    def _index_glue(self, intersections):
+        bridges = freeze(intersections)
+        self.bridges = bridges
+        self._bridges_by_entity = _group(
+            (entity, bridge)
+            for bridge in bridges
+            for entity in dict.fromkeys((bridge.get('source'), bridge.get('target')))
+            if entity
+        )
+        self._neighbors = _group(
+            pair
+            for bridge in bridges
+            for pair in ((bridge.get('source'), (bridge.get('target'), bridge)),
+                         (bridge.get('target'), (bridge.get('source'), bridge)))
+        )
+
+    def _index_capabilities(self, matrix):
+        domains = freeze(matrix.get('domains') or [])
+        by_name, domain_of = {}, {}
+        for domain in domains:
+            for capability in domain.get('capabilities') or EMPTY:
+                name = capability.get('name')
+                if name in by_name:
+                    raise ValueError(f"Capability {name} defined in {domain_of[name]} and {domain.get('id')}")
+                by_name[name] = capability
+                domain_of[name] = domain.get('id')
+        self.domains = MappingProxyType({d.get('id'): d for d in domains})
+        self.routing = freeze(matrix.get('routing') or {})
+        self.capabilities_by_name = MappingProxyType(by_name)
+        self._domain_of_capability = MappingProxyType(domain_of)
+        self._capabilities_by_domain = MappingProxyType({
+            d.get('id'): tuple(d.get('capabilities') or EMPTY) for d in domains
+        })
+
+    def _index_axioms(self, axioms):
+        frozen = freeze(axioms)
+        self.axioms = MappingProxyType({a.get('id'): a for a in frozen})
+        self._axioms_by_table = _group(
+            (table, axiom)
+            for axiom in frozen
+            for table in sorted(axiom_tables(axiom.get('validation_query')))
+        )
+        self._axioms_by_domain = _group((axiom.get('domain'), axiom) for axiom in frozen)
+
+    def _index_rules(self, rules):
+        frozen = freeze(rules)
+        self.rules = MappingProxyType({r.get('id'): r for r in frozen})
+        self._rules_by_capability = _group(
+            (capability, rule)
+            for rule in frozen
+            for capability in dict.fromkeys(
+                a.get('capability') for a in rule.get('actions') or EMPTY if a.get('capability')
+            )
+        )
+
+    # --- Taxonomy ----------------------------------------------------------
+
+    def ancestors(self, class_name):
+        """Ancestors of a class, nearest first (empty for roots and unknown classes)."""
+        return self._ancestors.get(class_name, EMPTY)
+
+    def descendants(self, class_name):
+        """Every class below `class_name` (frozenset, excluding itself)."""
+        return self._descendants.get(class_name, frozenset())
+
+    def is_a(self, class_name, other):
+        """True when class_name is `other` or one of its subclasses."""
+        return class_name == other or other in self._ancestor_sets.get(class_name, EMPTY)
+
+    def instances_under(self, class_name):
+        """Entities (e.g. SAAS.CLINICS) of the class and all its subclasses."""
+        return self._instances_under.get(class_name, EMPTY)
+
+    def class_of(self, entity):
+        """TAXONOMY class an entity is an instance of, or None."""
+        return self._class_of.get(entity)
+
+    # --- Federation --------------------------------------------------------
+
+    def bridges_for(self, entity):
+        """CROSS_DOMAIN_GLUE intersections with `entity` as source or target."""
+        return self._bridges_by_entity.get(entity, EMPTY)
+
+    def neighbors(self, entity):
+        """(other entity, bridge) pairs reachable through one glue bridge."""
+        return self._neighbors.get(entity, EMPTY)
+
+    def capabilities(self, domain):
+        """Capabilities a domain declares in CAPABILITY_MATRIX."""
+        return self._capabilities_by_domain.get(domain, EMPTY)
+
+    def capability(self, name):
+        """Capability record by name, or None."""
+        return self.capabilities_by_name.get(name)
+
+    def domain_of(self, capability_name):
+        """Domain id declaring a capability, or None."""
+        return self._domain_of_capability.get(capability_name)
+
+    # --- Axioms and rules --------------------------------------------------
+
+    def axioms_for_table(self, table):
+        """Axioms whose validation_query reads DB.SCHEMA.TABLE (case-insensitive)."""
+        return self._axioms_by_table.get(table.replace('"', '').upper(), EMPTY)
+
+    def axioms_for_domain(self, domain):
+        return self._axioms_by_domain.get(domain, EMPTY)
+
+    def axiom_tables(self):
+        """Every physical table referenced by some axiom."""
+        return tuple(self._axioms_by_table)
+
+    def rules_using(self, capability_name):
+        """Inference rules with an action calling `capability_name`."""
+        return self._rules_by_capability.get(capability_name, EMPTY)
+
+    def __repr__(self):
+        return (f"<OntologyGraph classes={len(self.classes)} bridges={len(self.bridges)} "
+                f"capabilities={len(self.capabilities_by_name)} axioms={len(self.axioms)} rules={len(self.rules)}>")
@@ -0,0 +1,204 @@
+"""
+Cross-domain join planner over CROSS_DOMAIN_GLUE bridges.
+
+plan_join() finds the cheapest chain of bridges between two qualified
+entities (Dijkstra over the glue graph, weighted by each bridge's
+`join.cost`) and renders it as Snowflake SQL. Every hop joins on the
+bridge's equality keys, so a plan can never degrade into a cartesian
+product; bridges without a structured `join` block are not plannable.
+
+Heuristic time windows (Budget -> Simulation, |created_at diff| <= 24h)
+are rewritten to be hash-join friendly. The right-hand side is bucketed
+by floor(epoch / window) and replicated into the neighbouring buckets
+(-1, 0, +1). It is then equi-joined on keys + bucket, and only the
+surviving pairs are checked with the exact BETWEEN predicate. Each pair
+within the window meets in exactly one replica, so the rewrite neither
+drops nor duplicates matches.
+
+Aliases are t0 (source entity) ... tN (target entity); `where` predicates
+use them.
+
+explain_cost() runs EXPLAIN on the generated SQL for a compile-time
+estimate (partitions/bytes scanned, join operators, cartesian joins).
+"""
+
+import heapq
+import itertools
+import re
+
+DEFAULT_BRIDGE_COST = 1
+COLUMN_RE = re.compile(r'^[A-Za-z_][\w$]*$')
+TABLE_RE = re.compile(r'^[\w$."]+$')
+BUCKET_COLUMN = "_JOIN_BUCKET"
+
+
+def bridge_join(bridge):
+    """
+    Validated `join` block of a bridge as {'keys', 'window', 'cost'}, or
+    None when the bridge only documents a relationship.
+    """
+    join = bridge.get('join')
+    if not join:
+        return None
+    name = f"{bridge.get('source')} -> {bridge.get('target')}"
+    keys = [tuple(pair) for pair in join.get('keys') or ()]
+    if not keys:
+        raise ValueError(f"Bridge {name}: join needs at least one equality key")
+    window = join.get('window')
+    columns = [column for pair in keys for column in pair]
+    if any(len(pair) != 2 for pair in keys):
+        raise ValueError(f"Bridge {name}: join keys must be [source_column, target_column] pairs")
+    if window:
+        columns += [window.get('source_column'), window.get('target_column')]
+        if not isinstance(window.get('hours'), (int, float)) or window['hours'] <= 0:
+            raise ValueError(f"Bridge {name}: window.hours must be a positive number")
+    bad = [c for c in columns if not isinstance(c, str) or not COLUMN_RE.match(c)]
+    if bad:
+        raise ValueError(f"Bridge {name}: invalid column names {bad}")
+    return {'keys': keys, 'window': dict(window) if window else None, 'cost': join.get('cost', DEFAULT_BRIDGE_COST)}
+
+
+def find_path(graph, source, target):
+    """
+    Cheapest bridge chain from `source` to `target`.
+
+    Returns (cost, hops) where each hop is (left entity, right entity,
+    bridge, join); hop keys are already oriented left -> right. Raises
+    ValueError when no plannable path exists.
+    """
+    if source == target:
+        raise ValueError(f"Source and target are the same entity ({source})")
+    counter = itertools.count()
+    heap = [(0, next(counter), source, ())]
+    settled = set()
+    while heap:
+        cost, _, entity, hops = heapq.heappop(heap)
+        if entity == target:
+            return cost, list(hops)
+        if entity in settled:
+            continue
+        settled.add(entity)
+        for other, bridge in graph.neighbors(entity):
+            join = bridge_join(bridge)
+            if join is None or other in settled:
+                continue
+            if bridge.get('source') != entity:
+                # Crossing the bridge backwards: swap every column pair
+                join = dict(join, keys=[(r, l) for l, r in join['keys']])
+                if join['window']:
+                    window = join['window']
+                    join['window'] = dict(window, source_column=window['target_column'],
+                                          target_column=window['source_column'])
+            heapq.heappush(heap, (cost + join['cost'], next(counter), other, hops + ((entity, other, bridge, join),)))
+    raise ValueError(f"No plannable bridge path from {source} to {target} in CROSS_DOMAIN_GLUE")
+
+
+def _table(entity, tables):
+    table = (tables or {}).get(entity, entity)
+    if not TABLE_RE.match(table):
+        raise ValueError(f"Invalid table name for {entity}: {table!r}")
+    return table
+
+
+def render_sql(source, hops, tables=None, select=None, where=None, limit=None):
+    """Snowflake SQL for a bridge chain (see module docstring for the window rewrite)."""
+    ctes, joins, star = [], [], ["t0.*"]
+    for i, (_, right, _, join) in enumerate(hops, start=1):
+        left_alias, alias = f"t{i - 1}", f"t{i}"
+        predicates = [f"{left_alias}.{l} = {alias}.{r}" for l, r in join['keys']]
+        window = join['window']
+        if window:
+            hours = window['hours']
+            width = int(hours * 3600)
+            lcol, rcol = window['source_column'], window['target_column']
+            cte = f"{alias}_bucketed"
+            ctes.append(
+                f"{cte} AS (\n"
+                f"    SELECT b.*, FLOOR(DATE_PART(EPOCH_SECOND, b.{rcol}) / {width}) + o.value::INT AS {BUCKET_COLUMN}\n"
+                f"    FROM {_table(right, tables)} b,\n"
+                f"    LATERAL FLATTEN(input => ARRAY_CONSTRUCT(-1, 0, 1)) o\n"
+                f")"
+            )
+            predicates.append(f"FLOOR(DATE_PART(EPOCH_SECOND, {left_alias}.{lcol}) / {width}) = {alias}.{BUCKET_COLUMN}")
+            predicates.append(
+                f"{alias}.{rcol} BETWEEN DATEADD(hour, -{hours}, {left_alias}.{lcol}) "
+                f"AND DATEADD(hour, {hours}, {left_alias}.{lcol})"
+            )
+            joins.append(f"JOIN {cte} {alias}")
+            star.append(f"{alias}.* EXCLUDE ({BUCKET_COLUMN})")
+        else:
+            joins.append(f"JOIN {_table(right, tables)} {alias}")
+            star.append(f"{alias}.*")
+        joins.append("  ON " + "\n AND ".join(predicates))
+
+    lines = []
+    if ctes:
+        lines.append("WITH " + ",\n".join(ctes))
+    lines.append("SELECT " + (select or ", ".join(star)))
+    lines.append(f"FROM {_table(source, tables)} t0")
+    lines.extend(joins)
+    if where:
+        lines.append("WHERE " + "\n  AND ".join(f"({w})" for w in where))
+    if limit:
+        lines.append(f"LIMIT {int(limit)}")
+    return "\n".join(lines)
+
+
+def plan_join(graph, source, target, tables=None, select=None, where=None, limit=None):
+    """
+    Plan a join between two qualified entities (e.g. SAAS.BUDGETS and
+    FINTECH.CREDIT_SIMULATIONS).
+
+    tables maps entities to physical tables (default: the entity name).
+    Returns {'source', 'target', 'path', 'bridges', 'cost', 'warnings', 'sql'}.
+    """
+    cost, hops = find_path(graph, source, target)
+    warnings = []
+    for left, right, bridge, join in hops:
+        if join['window']:
+            warnings.append(f"{left} -> {right} is a heuristic match ({join['window']['hours']}h window)")
+        if bridge.get('warning'):
+            warnings.append(" ".join(bridge['warning'].split()))
+    return {
+        'source': source,
+        'target': target,
+        'path': [source] + [right for _, right, _, _ in hops],
+        'bridges': [bridge.get('type') for _, _, bridge, _ in hops],
+        'cost': cost,
+        'warnings': warnings,
+        'sql': render_sql(source, hops, tables=tables, select=select, where=where, limit=limit),
+    }
+
+
+def explain_cost(sql, run_query=None):
+    """
+    Compile-time cost of a query from Snowflake's EXPLAIN USING TABULAR.
+
+    Returns {'partitions_total', 'partitions_assigned', 'bytes_assigned',
+    'operations' {operation: count}, 'cartesian'}, or None when EXPLAIN fails.
+    """
+    if run_query is None:
+        from utils.snowflake_connection import run_query
+
+    df = run_query(f"EXPLAIN USING TABULAR {sql}")
+    if df is None or df.empty:
+        return None
+    rows = [{str(k).lower(): v for k, v in row.items()} for row in df.to_dict('records')]
+    operations = {}
+    for row in rows:
+        op = row.get('operation')
+        if op and op != 'GlobalStats':
+            operations[op] = operations.get(op, 0) + 1
+    stats = next((row for row in rows if row.get('operation') == 'GlobalStats'), {})
+
+    def number(key):
+        value = stats.get(key)
+        return int(value) if value is not None and value == value else None
+
+    return {
+        'partitions_total': number('partitionstotal'),
+        'partitions_assigned': number('partitionsassigned'),
+        'bytes_assigned': number('bytesassigned'),
+        'operations': operations,
+        'cartesian': 'CartesianJoin' in operations,
+    }
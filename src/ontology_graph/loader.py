@@ -0,0 +1,56 @@
+"""
+Load the ontology/federation YAML files and compile them into an OntologyGraph.
+"""
+
+import os
+
+from .graph import OntologyGraph
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# build_graph() keyword -> path relative to the repo root
+SOURCES = {
+    'taxonomy': os.path.join('ontology', 'TAXONOMY.yaml'),
+    'glue': os.path.join('federation', 'CROSS_DOMAIN_GLUE.yaml'),
+    'capability_matrix': os.path.join('federation', 'CAPABILITY_MATRIX.yaml'),
+    'inference_rules': os.path.join('ontology', 'INFERENCE_RULES.yaml'),
+    'axioms': os.path.join('ontology', 'AXIOMS.yaml'),
+}
+
+
+def source_paths(root=REPO_ROOT):
+    """{source key: absolute path} of every input YAML."""
+    return {key: os.path.join(root, rel) for key, rel in SOURCES.items()}
+
+
+def parse_sources(root=REPO_ROOT):
+    """{source key: parsed YAML document} (a missing file parses as empty)."""
+    import yaml
+
+    # libyaml-backed loader when PyYAML was built with it (several times faster)
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    parsed = {}
+    for key, path in source_paths(root).items():
+        if not os.path.exists(path):
+            parsed[key] = {}
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            parsed[key] = yaml.load(f, Loader=loader) or {}
+    return parsed
+
+
+def build_graph(sources):
+    """OntologyGraph from parsed documents as returned by parse_sources()."""
+    return OntologyGraph(**{key: sources.get(key) for key in SOURCES})
+
+
+def load_graph(root=REPO_ROOT, use_snapshot=True):
+    """
+    Compile the graph for the sources under `root`.
+
+    Parsed sources come from the binary snapshot when it matches the current
+    YAML content (see snapshot.py); use_snapshot=False always parses the YAML.
+    """
+    from .snapshot import load_sources
+
+    return build_graph(load_sources(root, use_snapshot=use_snapshot))
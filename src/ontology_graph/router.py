@@ -0,0 +1,193 @@
+"""
+Capability router: question -> ranked CAPABILITY_MATRIX capabilities.
+
+Each capability is indexed as one weighted bag of terms built from its
+name (CamelCase split), its domain's priority_intents, its input names,
+its description and its example_queries. Terms are TF-IDF weighted and
+L2-normalised per capability and stored in an inverted index
+(term -> postings). route() only touches the postings of the question's
+terms, so it stays well under a millisecond with hundreds of capabilities.
+routing.intent_overrides give a small boost to candidates of the domain
+they name.
+
+No network models: tokenisation is lower-case, accent-folded, with a small
+EN/PT stopword list and naive suffix stripping.
+
+load_router() keeps one router per CAPABILITY_MATRIX content hash, so the
+index is rebuilt only when the YAML changes. The parsed YAML itself comes
+from the ontology snapshot.
+"""
+
+import hashlib
+import heapq
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections.abc import Mapping
+
+from .loader import REPO_ROOT, source_paths
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+CAMEL_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+STOPWORDS = frozenset("""
+    a an the of for to in on at by is are was were be been do does did what which who how why when
+    this that these those with from and or my me show give get tell there it its any all about
+    de da das dos do para por com em no na nos nas os as um uma uns umas o e que qual quais como
+""".split())
+# Relative weight of each capability field in its term bag
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'intent': 2.0,
+    'input': 1.0,
+    'description': 1.0,
+    'example': 1.0,
+}
+# Added to a candidate's score per question term overridden to its domain
+INTENT_BOOST = 0.15
+
+
+def stem(token):
+    """Naive suffix stripping so tickets/ticket and churning/churn share a term."""
+    if len(token) > 5 and token.endswith('ing'):
+        return token[:-3]
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Index/query terms of a text (CamelCase split, accent-folded, stopwords dropped)."""
+    if not text:
+        return []
+    text = CAMEL_RE.sub(' ', str(text))
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return [
+        stem(token) for token in TOKEN_RE.findall(text)
+        if len(token) > 1 and not token.isdigit() and token not in STOPWORDS
+    ]
+
+
+def matrix_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class CapabilityRouter:
+    """Inverted TF-IDF index over the capabilities of a CAPABILITY_MATRIX document."""
+
+    def __init__(self, matrix):
+        domains = (matrix or {}).get('domains') or []
+        overrides = ((matrix or {}).get('routing') or {}).get('intent_overrides') or {}
+
+        docs, bags = [], []
+        for domain in domains:
+            intents = [t for intent in domain.get('priority_intents') or [] for t in tokenize(intent)]
+            for capability in domain.get('capabilities') or []:
+                bag = {}
+                fields = (
+                    ('name', tokenize(capability.get('name'))),
+                    ('intent', intents),
+                    ('input', [t for i in capability.get('inputs') or [] for t in tokenize(i.get('name'))]),
+                    ('description', tokenize(capability.get('description'))),
+                    ('example', [t for q in capability.get('example_queries') or [] for t in tokenize(q)]),
+                )
+                for field, terms in fields:
+                    for term in terms:
+                        bag[term] = bag.get(term, 0.0) + FIELD_WEIGHTS[field]
+                docs.append((capability.get('name'), domain.get('id')))
+                bags.append(bag)
+
+        doc_freq = {}
+        for bag in bags:
+            for term in bag:
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+        total = len(bags)
+        idf = {term: math.log((total + 1) / (df + 1)) + 1.0 for term, df in doc_freq.items()}
+
+        postings = {}
+        for doc_id, bag in enumerate(bags):
+            weights = {term: (1.0 + math.log(tf)) * idf[term] for term, tf in bag.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((doc_id, weight / norm))
+
+        self.docs = tuple(docs)
+        self.idf = idf
+        self.postings = {term: tuple(p) for term, p in postings.items()}
+        self.intent_domains = {stem(str(k).lower()): v for k, v in overrides.items()}
+        self.triggers = tuple(
+            dict(t) if isinstance(t, Mapping) else t
+            for t in ((matrix or {}).get('routing') or {}).get('multi_domain_triggers') or []
+        )
+
+    def route(self, question, limit=5):
+        """
+        Ranked capabilities for a question: [{'capability', 'domain', 'score',
+        'terms' (matched question terms)}], best first. Empty when no term matches.
+        """
+        terms = {}
+        for term in tokenize(question):
+            if term in self.idf:
+                terms[term] = terms.get(term, 0) + 1
+        if not terms:
+            return []
+
+        query = {term: (1.0 + math.log(tf)) * self.idf[term] for term, tf in terms.items()}
+        norm = math.sqrt(sum(w * w for w in query.values()))
+        scores, matched = {}, {}
+        for term, q_weight in query.items():
+            for doc_id, d_weight in self.postings[term]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + q_weight * d_weight
+                matched.setdefault(doc_id, []).append(term)
+
+        boosted = [self.intent_domains[t] for t in terms if t in self.intent_domains]
+        best = heapq.nlargest(
+            limit,
+            ((score / norm + INTENT_BOOST * boosted.count(self.docs[doc_id][1]), doc_id)
+             for doc_id, score in scores.items()),
+        )
+        return [
+            {
+                'capability': self.docs[doc_id][0],
+                'domain': self.docs[doc_id][1],
+                'score': round(score, 4),
+                'terms': matched[doc_id],
+            }
+            for score, doc_id in best
+        ]
+
+    def match_triggers(self, question):
+        """routing.multi_domain_triggers whose pattern appears in the question."""
+        text = question.lower()
+        return [t for t in self.triggers if t.get('pattern') and t['pattern'].lower() in text]
+
+
+_routers = {}
+_routers_lock = threading.Lock()
+
+
+def load_router(root=REPO_ROOT):
+    """Router for root's CAPABILITY_MATRIX, rebuilt only when the file's hash changes."""
+    path = source_paths(root)['capability_matrix']
+    key = (os.path.abspath(root), matrix_hash(path))
+    with _routers_lock:
+        router = _routers.get(key)
+    if router is None:
+        from .snapshot import load_sources
+
+        router = CapabilityRouter(load_sources(root)['capability_matrix'])
+        with _routers_lock:
+            # Drop routers built for older versions of the same file
+            for stale in [k for k in _routers if k[0] == key[0]]:
+                del _routers[stale]
+            _routers[key] = router
+    return router
+
+
+def route(question, limit=5, root=REPO_ROOT):
+    """Shortcut for load_router(root).route(question, limit)."""
+    return load_router(root).route(question, limit=limit)
@@ -0,0 +1,91 @@
+"""
+Binary snapshot of the parsed ontology sources.
+
+PyYAML parsing dominates the start-up of every tool that reads the ontology;
+unpickling the already-parsed documents takes well under a millisecond.
+The snapshot stores the parsed documents (validated by compiling a graph
+before writing) together with a SHA-256 over the bytes of every input YAML.
+It is stale as soon as any source changes, and then the sources are parsed
+again (CSafeLoader when libyaml is available) and the snapshot rewritten.
+
+The snapshot file is local (gitignored) and written atomically.
+"""
+
+import hashlib
+import os
+import pickle
+
+from .loader import REPO_ROOT, build_graph, parse_sources, source_paths
+
+# Bump when the snapshot payload layout changes
+SNAPSHOT_VERSION = 1
+SNAPSHOT_NAME = ".graph_snapshot.pickle"
+
+
+def snapshot_path(root=REPO_ROOT):
+    """Snapshot location, next to the ontology sources."""
+    return os.path.join(root, 'ontology', SNAPSHOT_NAME)
+
+
+def sources_hash(root=REPO_ROOT):
+    """SHA-256 over the path key and bytes of every input YAML (missing files included as such)."""
+    digest = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+    for key, path in sorted(source_paths(root).items()):
+        digest.update(f"\0{key}\0".encode())
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def read_snapshot(path, expected_hash):
+    """Parsed sources from a snapshot matching `expected_hash`, else None."""
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get('version') != SNAPSHOT_VERSION:
+        return None
+    if payload.get('hash') != expected_hash:
+        return None
+    return payload.get('sources')
+
+
+def write_snapshot(path, content_hash, sources):
+    """Atomically replace the snapshot (best effort: a read-only tree just skips it)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            pickle.dump(
+                {'version': SNAPSHOT_VERSION, 'hash': content_hash, 'sources': sources},
+                f, protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_sources(root=REPO_ROOT, use_snapshot=True):
+    """
+    Parsed source documents, from the snapshot when it is fresh.
+
+    A stale or unreadable snapshot triggers a YAML parse; the result is
+    validated by compiling a graph and only then written back.
+    """
+    if not use_snapshot:
+        return parse_sources(root)
+    path = snapshot_path(root)
+    content_hash = sources_hash(root)
+    sources = read_snapshot(path, content_hash)
+    if sources is not None:
+        return sources
+    sources = parse_sources(root)
+    build_graph(sources)  # raises on invalid sources: never snapshot them
+    write_snapshot(path, content_hash, sources)
+    return sources
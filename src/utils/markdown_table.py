@@ -0,0 +1,100 @@
+"""
+Markdown table rendering for Capim Meta-Ontology reports.
+
+Shared by investigate.py, validate.py and check_sync.py. Tables are
+rendered column by column (one str() pass and one joined escape/replace per
+column) instead of cell by cell through DataFrame.iterrows(). DataFrames and
+plain lists of rows/dicts are both accepted, and pandas is never imported
+here, so callers that do not load it do not pay for it.
+
+Benchmark: scripts/bench_markdown_table.py
+"""
+
+ELLIPSIS = "…"
+# Cell separator used while cleaning a whole column at once
+_SEP = "\x00"
+
+
+def _is_dataframe(data) -> bool:
+    # Duck-typed so this module never imports pandas itself
+    return hasattr(data, "columns") and hasattr(data, "iloc")
+
+
+def _series_text(series) -> list:
+    """Cell strings of one DataFrame column."""
+    if getattr(series.dtype, "kind", "O") in "mM":
+        # Datetimes: pandas formats the whole column far faster than str(Timestamp)
+        return series.astype(str).tolist()
+    return list(map(str, series.tolist()))
+
+
+def _clean(text: str, max_width: int = None) -> str:
+    text = text.replace("\n", " ").replace("\r", "").replace("|", "\\|")
+    if max_width and len(text) > max_width:
+        return text[:max_width - 1] + ELLIPSIS
+    return text
+
+
+def _clean_column(values: list, max_width: int = None) -> list:
+    """
+    Escape one column of cell strings with whole-column string ops: the
+    column is joined once, scanned/replaced in C, and split back, instead of
+    cleaning cell by cell.
+    """
+    joined = _SEP.join(values)
+    if joined.count(_SEP) != len(values) - 1:
+        # A cell contains the separator itself: fall back to per-cell cleaning
+        return [_clean(v, max_width) for v in values]
+    if "\n" in joined or "\r" in joined or "|" in joined:
+        joined = joined.replace("\n", " ").replace("\r", "").replace("|", "\\|")
+        values = joined.split(_SEP)
+    if max_width and max(map(len, values)) > max_width:
+        values = [v if len(v) <= max_width else v[:max_width - 1] + ELLIPSIS for v in values]
+    return values
+
+
+def render_markdown_table(data, columns: list = None, max_rows: int = None, max_col_width: int = None) -> str:
+    """
+    Render rows as a GitHub-flavoured markdown table.
+
+    Args:
+        data: DataFrame, list of dicts, or list of sequences
+        columns: Header names (required for sequences; defaults to the
+            DataFrame columns or the keys of the first dict)
+        max_rows: Render only the first N rows, followed by a note with the
+            number of rows left out
+        max_col_width: Truncate cell text longer than this (with an ellipsis)
+
+    Returns:
+        Markdown string; "" when there is nothing to render
+    """
+    if data is None or len(data) == 0:
+        return ""
+
+    total = len(data)
+    shown = total if not max_rows else min(total, max_rows)
+
+    if _is_dataframe(data):
+        if data.shape[1] == 0:
+            return ""
+        frame = data.iloc[:shown]
+        headers = [str(c) for c in (columns or frame.columns)]
+        text_columns = [_series_text(frame.iloc[:, i]) for i in range(frame.shape[1])]
+    else:
+        rows = data[:shown]
+        if isinstance(rows[0], dict):
+            headers = list(columns or rows[0].keys())
+            text_columns = [[str(row.get(h, "")) for row in rows] for h in headers]
+        else:
+            headers = list(columns or range(len(rows[0])))
+            text_columns = [list(map(str, col)) for col in zip(*rows)]
+
+    cells = [_clean_column(col, max_col_width) for col in text_columns]
+    lines = ["| " + " | ".join(row) + " |" for row in zip(*cells)]
+
+    header = "| " + " | ".join(_clean(str(h)) for h in headers) + " |"
+    separator = "| " + " | ".join(["---"] * len(headers)) + " |"
+    out = "\n".join([header, separator, *lines])
+    if shown < total:
+        out += f"\n\n_… {total - shown:,} more rows not shown ({total:,} total)_"
+    return out
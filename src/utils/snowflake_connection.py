@@ -1,22 +1,70 @@
 """
 Snowflake Connection Utility for Capim Meta-Ontology
 Provides connection and query execution functions.
+
+Connections are pooled per process: run_query() borrows an authenticated
+session from the pool instead of logging in for every statement. Wrap
+multi-query workflows in `with snowflake_session():` to pin one session
+for every run_query() call made inside the block.
+
+Read-only queries can opt into a local disk cache with run_query(sql, cache=True)
+(or cache=<ttl seconds>), so repeated lookups do not wake a warehouse.
+
+Large result sets should be streamed with iter_query() (or written straight
+to disk with query_to_parquet()) instead of materialised by run_query().
 """
 
 import os
-import snowflake.connector
-import pandas as pd
-from dotenv import load_dotenv
+import re
+import atexit
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas, snowflake.connector and python-dotenv are imported on first use:
+# importing this module (and `--help` of every script that does) stays fast.
+_env_loaded = False
+
+
+def _load_env():
+    """Load environment variables from the .env file (once)."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
-# Load environment variables from .env file
-load_dotenv()
+# Idle sessions older than this are closed instead of reused.
+SESSION_MAX_IDLE_SECONDS = 15 * 60
+# Idle sessions kept around for reuse (concurrent borrowers may exceed it).
+SESSION_POOL_SIZE = 8
 
+# Opt-in query result cache (run_query(..., cache=True));
+# SNOWFLAKE_QUERY_CACHE_DIR overrides the directory.
+QUERY_CACHE_DIR = Path(__file__).resolve().parents[2] / ".query_cache"
+QUERY_CACHE_TTL_SECONDS = 60 * 60
+QUERY_CACHE_MAX_BYTES = 512 * 1024 * 1024
 
-def get_snowflake_connection():
+
+def get_snowflake_connection(keep_alive: bool = False):
     """
     Establishes a connection to Snowflake using credentials from .env file.
     Returns the connection object, or None if it fails.
+
+    Args:
+        keep_alive: Ask Snowflake to keep the session alive while idle
+            (used for pooled sessions).
     """
+    import snowflake.connector
+
+    _load_env()
     required_credentials = {
         "user": os.getenv("SNOWFLAKE_USER"),
         "password": os.getenv("SNOWFLAKE_PASSWORD"),
@@ -40,7 +88,9 @@ def get_snowflake_connection():
             **required_credentials,
             **{k: v for k, v in optional_credentials.items() if v is not None}
         }
-        
+        if keep_alive:
+            connect_args["client_session_keep_alive"] = True
+
         conn = snowflake.connector.connect(**connect_args)
         print("Snowflake connection established successfully!")
         return conn
@@ -49,40 +99,440 @@ def get_snowflake_connection():
         return None
 
 
-def run_query(query: str) -> pd.DataFrame:
+class SnowflakeSessionPool:
+    """
+    Thread-safe pool of authenticated Snowflake connections.
+
+    Sessions are handed out LIFO (the most recently used one is the most
+    likely to still be warm), closed when idle longer than max_idle seconds,
+    and dropped when they come back closed or broken.
+    """
+
+    def __init__(self, max_size: int = SESSION_POOL_SIZE, max_idle: float = SESSION_MAX_IDLE_SECONDS):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._idle = []  # [(conn, last_used)]
+        self._lock = threading.Lock()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [conn for conn, last_used in self._idle if now - last_used > self.max_idle]
+        self._idle = [(conn, last_used) for conn, last_used in self._idle if now - last_used <= self.max_idle]
+        return expired
+
+    def acquire(self):
+        """Borrow a session (new login only if no idle one is available). None on failure."""
+        while True:
+            with self._lock:
+                expired = self._evict_expired()
+                conn = self._idle.pop()[0] if self._idle else None
+            for old in expired:
+                _close_quietly(old)
+            if conn is None:
+                return get_snowflake_connection(keep_alive=True)
+            if not conn.is_closed():
+                return conn
+
+    def release(self, conn, broken: bool = False):
+        """Return a borrowed session; broken or surplus sessions are closed."""
+        if broken or conn.is_closed():
+            _close_quietly(conn)
+            return
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        _close_quietly(conn)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+_session_pool = SnowflakeSessionPool()
+atexit.register(_session_pool.close_all)
+
+# Session pinned by an enclosing `with snowflake_session()` block, per thread.
+_pinned = threading.local()
+
+
+@contextmanager
+def snowflake_session():
+    """
+    Context manager yielding a pooled Snowflake connection.
+
+    Every run_query() issued by this thread inside the block reuses that
+    connection. Nested blocks share the outer session.
+
+        with snowflake_session() as conn:
+            schema = run_query("SELECT ... FROM INFORMATION_SCHEMA.COLUMNS ...")
+            volume = run_query("SELECT COUNT(*) FROM ...")
+
+    Raises:
+        ConnectionError: if no session could be established.
+    """
+    import snowflake.connector
+
+    current = getattr(_pinned, "conn", None)
+    if current is not None:
+        yield current
+        return
+
+    conn = _session_pool.acquire()
+    if conn is None:
+        raise ConnectionError("Could not establish a Snowflake session (see error above).")
+    _pinned.conn = conn
+    broken = False
+    try:
+        yield conn
+    except snowflake.connector.errors.OperationalError:
+        # Network/session level failure: do not hand this session out again.
+        broken = True
+        raise
+    finally:
+        _pinned.conn = None
+        _session_pool.release(conn, broken=broken)
+
+
+READ_ONLY_RE = re.compile(r"^\s*(SELECT|WITH|SHOW|DESC|DESCRIBE)\b", re.IGNORECASE)
+
+
+def is_read_only(query: str) -> bool:
+    """True for statements whose result is safe to cache."""
+    return bool(READ_ONLY_RE.match(re.sub(r"^(\s*--[^\n]*\n)+", "", query)))
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace outside string literals and drop a trailing semicolon."""
+    parts = re.split(r"('(?:[^']|'')*')", query.strip().rstrip(';').strip())
+    return "".join(
+        part if i % 2 else re.sub(r"\s+", " ", part)
+        for i, part in enumerate(parts)
+    )
+
+
+def query_cache_key(query: str) -> str:
+    """Cache key: normalized SQL plus the role/warehouse/database it runs under."""
+    _load_env()
+    context = "|".join(os.getenv(var, "") for var in ("SNOWFLAKE_ROLE", "SNOWFLAKE_WAREHOUSE", "SNOWFLAKE_DATABASE"))
+    return hashlib.sha256(f"{context}\n{normalize_sql(query)}".encode("utf-8")).hexdigest()
+
+
+class QueryResultCache:
+    """
+    Disk cache of query results, one Parquet file per key.
+
+    A file's mtime is its write time (TTL) and its atime is set on every hit
+    (LRU): when the directory grows past max_bytes the least recently used
+    results are deleted first. Requires pyarrow; without it caching is a no-op.
+    """
+
+    def __init__(self, directory: Path = None, max_bytes: int = QUERY_CACHE_MAX_BYTES):
+        self._directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._disabled = False
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            _load_env()
+            self._directory = Path(os.getenv("SNOWFLAKE_QUERY_CACHE_DIR") or QUERY_CACHE_DIR)
+        return self._directory
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    def get(self, key: str, ttl: float):
+        """Cached DataFrame, or None when missing or older than ttl seconds."""
+        path = self._path(key)
+        try:
+            written = path.stat().st_mtime
+            if time.time() - written > ttl:
+                path.unlink()
+                return None
+            import pandas as pd
+            df = pd.read_parquet(path)
+            os.utime(path, (time.time(), written))
+            return df
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: ignoring unreadable query cache entry {path.name}: {e}")
+            return None
+
+    def put(self, key: str, df: "pd.DataFrame"):
+        if self._disabled:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        except ImportError as e:
+            print(f"Warning: query cache disabled ({e})")
+            self._disabled = True
+            return
+        except Exception as e:
+            print(f"Warning: could not cache query result: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.parquet"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def clear(self):
+        for path in self.directory.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+
+
+_query_cache = QueryResultCache()
+
+
+def clear_query_cache():
+    """Delete every cached query result."""
+    _query_cache.clear()
+
+
+def close_sessions():
+    """Close every idle pooled session (also runs automatically at exit)."""
+    _session_pool.close_all()
+
+
+def run_query(query: str, pooled: bool = True, timeout: int = None, cache=False) -> "pd.DataFrame":
     """
     Executes a SQL query on Snowflake and returns results as a Pandas DataFrame.
-    
+
     Args:
         query: SQL query string
-        
+        pooled: Use a pooled session (default). False opens and closes a
+            dedicated connection, as before pooling existed.
+        timeout: Seconds after which Snowflake cancels the query (None = no limit)
+        cache: Serve/store the result in the local query cache. True uses
+            QUERY_CACHE_TTL_SECONDS, an int sets the TTL in seconds. Only
+            read-only statements (SELECT/WITH/SHOW/DESCRIBE) are cached.
+
     Returns:
         DataFrame with results, or None if error
     """
-    conn = get_snowflake_connection()
-    if conn:
-        try:
-            cur = conn.cursor()
-            cur.execute(query)
-            if cur.description is None:
-                return pd.DataFrame()
-            return cur.fetch_pandas_all()
-        except Exception as e:
-            print(f"Error executing query: {e}")
-            return None
-        finally:
-            conn.close()
-    return None
+    ttl = QUERY_CACHE_TTL_SECONDS if cache is True else cache
+    key = None
+    if ttl and is_read_only(query):
+        key = query_cache_key(query)
+        cached = _query_cache.get(key, ttl)
+        if cached is not None:
+            return cached
+
+    df = _run_uncached(query, pooled, timeout)
+    if key is not None and df is not None:
+        _query_cache.put(key, df)
+    return df
+
+
+def _run_uncached(query: str, pooled: bool, timeout: int) -> "pd.DataFrame":
+    if not pooled:
+        conn = get_snowflake_connection()
+        if conn:
+            try:
+                return _execute(conn, query, timeout)
+            except Exception as e:
+                print(f"Error executing query: {e}")
+                return None
+            finally:
+                conn.close()
+        return None
+
+    try:
+        with snowflake_session() as conn:
+            return _execute(conn, query, timeout)
+    except ConnectionError:
+        return None
+    except Exception as e:
+        print(f"Error executing query: {e}")
+        return None
+
+
+def _execute(conn, query: str, timeout: int = None) -> "pd.DataFrame":
+    cur = conn.cursor()
+    try:
+        cur.execute(query, timeout=timeout)
+        if cur.description is None:
+            import pandas as pd
+            return pd.DataFrame()
+        return cur.fetch_pandas_all()
+    finally:
+        cur.close()
+
+
+def iter_query(query: str, batch_rows: int = 100_000, arrow: bool = False, timeout: int = None):
+    """
+    Executes a SQL query and streams the result in batches of at most
+    batch_rows rows, so memory stays bounded regardless of result size.
+
+    Args:
+        query: SQL query string
+        batch_rows: Maximum rows per yielded batch
+        arrow: Yield pyarrow.RecordBatch objects instead of DataFrames
+        timeout: Seconds after which Snowflake cancels the query (None = no limit)
+
+    Yields:
+        DataFrame (or RecordBatch) chunks, in result order
+
+    Raises:
+        ConnectionError: if no session could be established.
+    """
+    import snowflake.connector
+
+    conn = getattr(_pinned, "conn", None)
+    borrowed = conn is None
+    if borrowed:
+        conn = _session_pool.acquire()
+        if conn is None:
+            raise ConnectionError("Could not establish a Snowflake session (see error above).")
+
+    broken = False
+    cur = conn.cursor()
+    try:
+        cur.execute(query, timeout=timeout)
+        if cur.description is None:
+            return
+        if arrow:
+            for table in cur.fetch_arrow_batches():
+                yield from table.to_batches(max_chunksize=batch_rows)
+        else:
+            for df in cur.fetch_pandas_batches():
+                for start in range(0, len(df), batch_rows):
+                    yield df.iloc[start:start + batch_rows]
+    except snowflake.connector.errors.OperationalError:
+        broken = True
+        raise
+    finally:
+        cur.close()
+        if borrowed:
+            _session_pool.release(conn, broken=broken)
+
+
+# Batches held in memory while some column has only been seen all-null (its
+# type is unknown); past this, such columns are written as strings.
+PARQUET_SCHEMA_PROBE_BATCHES = 16
+
+
+def _parquet_type(pa, dtype):
+    """Type a column is written with: chunks may use narrower numeric types, so widen them."""
+    if pa.types.is_integer(dtype):
+        return pa.int64()
+    if pa.types.is_floating(dtype):
+        return pa.float64()
+    return dtype
+
+
+def query_to_parquet(query: str, path, batch_rows: int = 100_000, timeout: int = None) -> int:
+    """
+    Streams a query result straight into a Parquet file, one row group per
+    batch, without holding the full result in memory. Requires pyarrow.
+    No file is created when the query returns no rows.
+
+    The file schema is fixed when the writer opens, and Snowflake types each
+    Arrow chunk from its own values: integer and float columns are widened to
+    int64/float64, and columns that are all-null in the first chunks are held
+    back (up to PARQUET_SCHEMA_PROBE_BATCHES batches) until a chunk shows
+    their type. A failed export removes the partial file.
+
+    Returns:
+        Number of rows written
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = str(path)
+    writer = None
+    pending = []  # batches read before every column's type is known
+    types = None  # per column position; pa.null() until seen with values
+    rows = 0
+    started = False  # the file at `path` is ours to remove on failure
+
+    def open_writer():
+        nonlocal started
+        started = True
+        return pq.ParquetWriter(path, pa.schema([
+            pa.field(name, pa.string() if pa.types.is_null(dtype) else dtype)
+            for name, dtype in types
+        ]))
+
+    def write(batch):
+        table = pa.Table.from_batches([batch])
+        if table.schema != writer.schema:
+            table = table.cast(writer.schema)
+        writer.write_table(table)
+
+    try:
+        for batch in iter_query(query, batch_rows=batch_rows, arrow=True, timeout=timeout):
+            rows += batch.num_rows
+            if writer is not None:
+                write(batch)
+                continue
+            fields = [(f.name, _parquet_type(pa, f.type)) for f in batch.schema]
+            types = fields if types is None else [
+                resolved if pa.types.is_null(known) else (name, known)
+                for (name, known), resolved in zip(types, fields)
+            ]
+            pending.append(batch)
+            if any(pa.types.is_null(dtype) for _, dtype in types) and len(pending) < PARQUET_SCHEMA_PROBE_BATCHES:
+                continue
+            writer = open_writer()
+            for held in pending:
+                write(held)
+            pending = []
+        if pending:
+            writer = open_writer()
+            for held in pending:
+                write(held)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            writer = None
+        if started and os.path.exists(path):
+            os.remove(path)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
 
 
 def validate_axiom(axiom_id: str, validation_query: str) -> dict:
     """
     Runs an axiom validation query and returns the result.
-    
+
     Args:
         axiom_id: The ID of the axiom being validated
         validation_query: SQL query that should return 0 for PASS
-        
+
     Returns:
         dict with {axiom_id, status, count, message}
     """
@@ -94,10 +544,10 @@ def validate_axiom(axiom_id: str, validation_query: str) -> dict:
             "count": -1,
             "message": "Failed to execute query"
         }
-    
+
     count = result.iloc[0, 0] if len(result) > 0 else 0
     status = "PASS" if count == 0 else "FAIL"
-    
+
     return {
         "axiom_id": axiom_id,
         "status": status,
@@ -0,0 +1,48 @@
+"""
+Physical tables read by a SQL query (axiom validation_query and friends).
+
+Shared by ontology_graph (table -> axioms index) and validate.py (result
+cache), so both agree on which DB.SCHEMA.TABLE names a query reads. Only
+FROM/JOIN targets count; CTE names are ignored, and any other unqualified
+name marks the reference set as incomplete.
+"""
+
+import re
+
+TABLE_REF_RE = re.compile(r'\b(?:FROM|JOIN)\s+([\w$."]+)', re.IGNORECASE)
+CTE_NAME_RE = re.compile(r'(?:\bWITH|,)\s*(\w+)\s+AS\s*\(', re.IGNORECASE)
+
+
+def strip_sql_comments(sql: str) -> str:
+    """Drop `--` line comments, leaving quoted string literals untouched."""
+    out = []
+    for line in sql.splitlines():
+        in_quote = False
+        for i, ch in enumerate(line):
+            if ch == "'":
+                in_quote = not in_quote
+            elif not in_quote and line.startswith('--', i):
+                line = line[:i]
+                break
+        out.append(line)
+    return "\n".join(out)
+
+
+def table_refs(sql: str):
+    """
+    (tables, complete): the upper-cased DB.SCHEMA.TABLE names the query
+    reads, and whether those are all it reads (False when some FROM/JOIN
+    target is an unqualified name that is not a CTE).
+    """
+    if not sql:
+        return frozenset(), True
+    sql = strip_sql_comments(sql)
+    ctes = {name.upper() for name in CTE_NAME_RE.findall(sql)}
+    tables, complete = set(), True
+    for ref in TABLE_REF_RE.findall(sql):
+        name = ref.replace('"', '').upper()
+        if name.count('.') == 2:
+            tables.add(name)
+        elif name not in ctes:
+            complete = False
+    return frozenset(tables), complete